@@ -0,0 +1,59 @@
+"""
+Microbenchmark de la conversión texto ↔ números del alfabeto.
+
+Compara la conversión carácter por carácter (char_a_num / num_a_char) con
+las tablas precompiladas (text_to_numbers / numbers_to_text).
+
+Uso:
+    python bench_alphabet.py [longitud]
+"""
+
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from logic.crypto_logic import (
+    ALPHABET,
+    char_a_num,
+    num_a_char,
+    numbers_to_text,
+    text_to_numbers,
+)
+
+
+def medir(fn, arg, repeticiones=5):
+    """Retorna el mejor tiempo (segundos) de fn(arg)."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn(arg)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    longitud = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(1)
+    simbolos = ''.join(ALPHABET) + 'abcxyzñ!?'
+    texto = ''.join(rng.choice(simbolos) for _ in range(longitud))
+    nums = text_to_numbers(texto).tolist()
+    
+    casos = [
+        ("texto → números", lambda t: [char_a_num(c) for c in t], text_to_numbers, texto),
+        ("números → texto", lambda ns: ''.join(num_a_char(n) for n in ns), numbers_to_text, nums),
+    ]
+    
+    print(f"Longitud: {longitud:,} caracteres\n")
+    print(f"{'conversión':<18} {'antes (car/s)':>16} {'después (car/s)':>18} {'aceleración':>12}")
+    print("-" * 68)
+    for nombre, antes, despues, arg in casos:
+        t_antes = medir(antes, arg, repeticiones=2)
+        t_despues = medir(despues, arg)
+        print(f"{nombre:<18} {longitud / t_antes:>16,.0f} {longitud / t_despues:>18,.0f} "
+              f"{t_antes / t_despues:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark del criptoanálisis del cifrado Hill.
+
+Uso:
+    python bench_cryptanalysis.py [n_max_fuerza_bruta] [procesos]
+
+Mide la recuperación de la clave con texto plano conocido para varios
+tamaños de bloque y la tasa de candidatos por segundo de la fuerza bruta
+sobre las n^n funciones (por defecto hasta n = 7).
+"""
+
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from logic import CryptoEngine
+from logic.cryptanalysis import fuerza_bruta, recuperar_clave
+
+TEXTO = "EL VELOZ MURCIELAGO HINDU COMIA FELIZ CARDILLO Y KIWI. LA CIGUENA TOCABA EL SAXOFON DETRAS DEL PALENQUE DE PAJA. "
+
+
+def bench_texto_conocido():
+    rng = random.Random(23)
+    print("Recuperación con texto plano conocido")
+    print(f"{'n':>5} {'caracteres':>11} {'tiempo (ms)':>12} {'clave correcta':>15}")
+    print("-" * 46)
+    for n in (3, 5, 9, 15, 20, 25, 30):
+        ce = CryptoEngine(n)
+        ce.set_key_from_function([rng.randrange(n) for _ in range(n)])
+        texto = (TEXTO * (n * n // 10 + 2))[:min(899, 4 * n * n)]
+        cifrado = ce.encrypt(texto)
+        
+        inicio = time.perf_counter()
+        key = recuperar_clave(texto, cifrado, n)
+        t = time.perf_counter() - inicio
+        ok = "sí" if key == ce.key.tolist() else ("no determinada" if key is None else "NO")
+        print(f"{n:>5} {len(texto):>11} {t * 1e3:>12.2f} {ok:>15}")
+    print()
+
+
+def bench_fuerza_bruta(n_max, procesos):
+    print(f"Fuerza bruta sobre las n^n funciones ({procesos} procesos)")
+    print(f"{'n':>5} {'funciones':>12} {'tiempo (s)':>11} {'candidatos/s':>14} {'aciertos':>9}")
+    print("-" * 55)
+    for n in range(3, n_max + 1):
+        ce = CryptoEngine(n)
+        ce.set_key_from_function([(3 * i + 1) % n for i in range(n)])
+        cifrado = ce.encrypt("ATAQUE AL AMANECER")
+        r = fuerza_bruta(cifrado, n, fragmento="ATAQUE", procesos=procesos)
+        print(f"{n:>5} {r['total']:>12,} {r['segundos']:>11.2f} "
+              f"{r['candidatos_por_segundo']:>14,.0f} {r['total_aciertos']:>9,}")
+    print()
+
+
+def main():
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    bench_texto_conocido()
+    bench_fuerza_bruta(n_max, procesos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark del cifrado de archivos en paralelo.
+
+Uso:
+    python bench_file_cipher.py [megabytes] [procesos_max]
+
+Genera un archivo de texto aleatorio y mide encrypt_file / decrypt_file con
+1 a procesos_max procesos (por defecto todos los núcleos), junto con el
+cifrado secuencial de encrypt_stream como referencia.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+from logic import CryptoEngine
+from logic.crypto_logic import ALPHABET
+from logic.file_cipher import decrypt_file, encrypt_file
+
+
+def cronometrar(fn, *args, **kwargs):
+    """Retorna el tiempo (segundos) de una llamada a fn(*args, **kwargs)."""
+    inicio = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 32
+    procesos_max = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    n = 9
+    ce = CryptoEngine(n)
+    ce.set_key_from_function([(4 * i + 1) % n for i in range(n)])
+    
+    rng = random.Random(25)
+    simbolos = ''.join(ALPHABET) + 'abcdefghij\n'
+    pieza = ''.join(rng.choice(simbolos) for _ in range(1 << 20))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        plano, cifrado, descifrado = (os.path.join(tmp, nombre) for nombre in ("plano", "cifrado", "descifrado"))
+        with open(plano, 'w', encoding='utf-8', newline='') as fh:
+            for _ in range(int(megabytes)):
+                fh.write(pieza)
+        mb = os.path.getsize(plano) / 1e6
+        
+        with open(plano, encoding='utf-8', newline='') as fuente, open(cifrado, 'w', encoding='utf-8') as dest:
+            t_stream = cronometrar(ce.encrypt_stream, fuente, dest)
+        print(f"{mb:.1f} MB, n = {n}, {os.cpu_count()} núcleos")
+        print(f"encrypt_stream (secuencial): {t_stream:.2f} s ({mb / t_stream:.1f} MB/s)\n")
+        
+        print(f"{'procesos':>9} {'cifrar (s)':>11} {'MB/s':>7} {'descifrar (s)':>14} {'MB/s':>7} {'escala':>7}")
+        print("-" * 61)
+        base = None
+        for procesos in range(1, procesos_max + 1):
+            t_cif = cronometrar(encrypt_file, plano, cifrado, ce.key, n, procesos)
+            t_des = cronometrar(decrypt_file, cifrado, descifrado, ce.key, n, procesos)
+            base = base or t_cif
+            print(f"{procesos:>9} {t_cif:>11.2f} {mb / t_cif:>7.1f} {t_des:>14.2f} {mb / t_des:>7.1f} {base / t_cif:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
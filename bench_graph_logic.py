@@ -0,0 +1,167 @@
+"""
+Benchmarks de la lógica de grafos.
+
+Uso:
+    python bench_graph_logic.py [caso ...]
+
+Sin argumentos ejecuta todos los casos.
+"""
+
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from logic.graph_logic import GraphLogic
+from logic.joyal_batch import arboles_desde_funciones, funciones_desde_arboles
+from logic.prufer import arbol_aleatorio, codificar_lote, codificar_prufer, decodificar_lote, decodificar_prufer
+
+
+def funcion_aleatoria(n, rng):
+    """Genera una función aleatoria de {0..n-1} en sí mismo."""
+    return [rng.randrange(n) for _ in range(n)]
+
+
+def cronometrar(fn, *args):
+    """Retorna el tiempo (segundos) de una llamada a fn(*args)."""
+    inicio = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - inicio
+
+
+def bench_ciclos():
+    """vertices_en_ciclo: recorrido por punteros frente a DFS por arista."""
+    rng = random.Random(9)
+    gl = GraphLogic(1)
+    print("vertices_en_ciclo (función aleatoria)")
+    print(f"{'n':>9} {'punteros (ms)':>14} {'ns/vértice':>11} {'DFS (ms)':>10}")
+    print("-" * 48)
+    for n in (10**3, 3 * 10**3, 10**4, 10**5, 10**6):
+        aristas = list(enumerate(funcion_aleatoria(n, rng)))
+        t = cronometrar(gl.vertices_en_ciclo, aristas)
+        t_dfs = cronometrar(gl._vertices_en_ciclo_dfs, aristas) if n <= 3 * 10**3 else None
+        dfs = f"{t_dfs * 1e3:>10.1f}" if t_dfs is not None else f"{'-':>10}"
+        print(f"{n:>9,} {t * 1e3:>14.1f} {t / n * 1e9:>11.0f} {dfs}")
+    print()
+
+
+def arbol_camino(n):
+    """Construye el árbol camino 0 - 1 - ... - n-1, el peor caso de profundidad."""
+    gl = GraphLogic(n)
+    for i in range(n - 1):
+        gl.agregar_arista(i, i + 1)
+    return gl
+
+
+def bench_camino():
+    """depthfirstsearch entre los extremos de un árbol camino."""
+    print("depthfirstsearch (árbol camino, extremo a extremo)")
+    print(f"{'n':>9} {'tiempo (ms)':>12} {'ns/vértice':>11}")
+    print("-" * 34)
+    for n in (10**3, 10**4, 10**5, 10**6):
+        gl = arbol_camino(n)
+        t = cronometrar(gl.depthfirstsearch, 0, n - 1)
+        print(f"{n:>9,} {t * 1e3:>12.1f} {t / n * 1e9:>11.0f}")
+    print()
+
+
+def bench_joyal():
+    """construir_arbol_desde_funcion sobre funciones aleatorias grandes."""
+    rng = random.Random(12)
+    gl = GraphLogic(1)
+    print("construir_arbol_desde_funcion (función aleatoria)")
+    print(f"{'n':>9} {'tiempo (ms)':>12} {'ns/vértice':>11}")
+    print("-" * 34)
+    for n in (10**3, 10**4, 10**5, 10**6):
+        funcion = funcion_aleatoria(n, rng)
+        t = cronometrar(gl.construir_arbol_desde_funcion, funcion)
+        print(f"{n:>9,} {t * 1e3:>12.1f} {t / n * 1e9:>11.0f}")
+    print()
+
+
+def bench_lote():
+    """Biyección por lotes: muchas funciones pequeñas en arreglos de NumPy."""
+    rng = np.random.default_rng(14)
+    print("arboles_desde_funciones / funciones_desde_arboles (lote k × n)")
+    print(f"{'k':>9} {'n':>4} {'f→árbol (ms)':>13} {'árbol→f (ms)':>13} {'elementos/s':>13}")
+    print("-" * 56)
+    for k, n in ((10**4, 9), (10**5, 9), (10**6, 9), (10**4, 100), (10**3, 1000)):
+        funciones = rng.integers(0, n, size=(k, n))
+        inicio = time.perf_counter()
+        padres, inicios = arboles_desde_funciones(funciones)
+        medio = time.perf_counter()
+        funciones_desde_arboles(padres, inicios)
+        fin = time.perf_counter()
+        print(f"{k:>9,} {n:>4} {(medio - inicio) * 1e3:>13.1f} {(fin - medio) * 1e3:>13.1f} "
+              f"{k / (fin - inicio):>13,.0f}")
+    print()
+
+
+def kruskal_aleatorio(n, rng):
+    """Generador anterior: barajar todas las aristas posibles y unir con Kruskal."""
+    gl = GraphLogic(n)
+    posibles = [(i, j) for i in range(n) for j in range(i + 1, n)]
+    rng.shuffle(posibles)
+    for v1, v2 in posibles:
+        if len(gl.aristas) == n - 1:
+            break
+        gl.agregar_arista(v1, v2)
+    return gl.aristas
+
+
+def bench_arbol_aleatorio():
+    """Árbol etiquetado aleatorio: decodificación de Prüfer frente a Kruskal sobre K_n."""
+    rng = random.Random(18)
+    print("árbol aleatorio (Prüfer en O(n) frente a Kruskal sobre todas las aristas)")
+    print(f"{'n':>9} {'Prüfer (ms)':>12} {'ns/vértice':>11} {'Kruskal (ms)':>13}")
+    print("-" * 48)
+    for n in (10**2, 10**3, 3 * 10**3, 10**4, 10**5, 10**6):
+        t = cronometrar(arbol_aleatorio, n, rng)
+        t_k = cronometrar(kruskal_aleatorio, n, rng) if n <= 3 * 10**3 else None
+        kruskal = f"{t_k * 1e3:>13.1f}" if t_k is not None else f"{'-':>13}"
+        print(f"{n:>9,} {t * 1e3:>12.1f} {t / n * 1e9:>11.0f} {kruskal}")
+    print()
+
+
+def bench_prufer():
+    """Codificación y decodificación de Prüfer: por lotes frente a árbol por árbol."""
+    rng = np.random.default_rng(19)
+    print("decodificar_lote / codificar_lote frente a las versiones simples (lote k × n)")
+    print(f"{'k':>9} {'n':>5} {'dec. lote':>10} {'dec. simple':>12} {'cod. lote':>10} {'cod. simple':>12}  (ms)")
+    print("-" * 68)
+    for k, n in ((10**4, 9), (10**5, 9), (10**4, 100), (10**3, 1000), (10, 10**5)):
+        secuencias = rng.integers(0, n, size=(k, n - 2))
+        filas = secuencias.tolist()
+        inicio = time.perf_counter()
+        lote = decodificar_lote(secuencias, n)
+        t_dec = time.perf_counter() - inicio
+        t_dec_s = cronometrar(lambda: [decodificar_prufer(s, n) for s in filas])
+        t_cod = cronometrar(codificar_lote, lote)
+        aristas = lote.tolist()
+        t_cod_s = cronometrar(lambda: [codificar_prufer(a, n) for a in aristas])
+        print(f"{k:>9,} {n:>5} {t_dec * 1e3:>10.1f} {t_dec_s * 1e3:>12.1f} "
+              f"{t_cod * 1e3:>10.1f} {t_cod_s * 1e3:>12.1f}")
+    print()
+
+
+CASOS = {
+    'ciclos': bench_ciclos,
+    'camino': bench_camino,
+    'joyal': bench_joyal,
+    'lote': bench_lote,
+    'arbol_aleatorio': bench_arbol_aleatorio,
+    'prufer': bench_prufer,
+}
+
+
+def main():
+    nombres = sys.argv[1:] or list(CASOS)
+    for nombre in nombres:
+        CASOS[nombre]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark de la inversa modular: Gauss-Jordan con CRT frente a la adjunta.
+
+Uso:
+    python bench_inverse.py [n_max] [n_max_adjunta]
+
+La ruta por adjunta es O(n⁵) con enteros grandes, por lo que solo se mide
+hasta n_max_adjunta (por defecto 40); por encima se reporta solo Gauss-Jordan.
+"""
+
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from logic.math_utils import inverse_matrix_mod, inverse_matrix_mod_adjugate
+
+MOD = 30
+
+
+def matriz_invertible_aleatoria(n, rng):
+    """Genera una matriz n×n aleatoria invertible módulo MOD."""
+    while True:
+        M = [[rng.randrange(MOD) for _ in range(n)] for _ in range(n)]
+        if inverse_matrix_mod(M, MOD) is not None:
+            return M
+
+
+def medir(fn, M, repeticiones=1):
+    """Retorna el tiempo medio (segundos) de fn(M, MOD)."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = fn(M, MOD)
+    return (time.perf_counter() - inicio) / repeticiones, resultado
+
+
+def main():
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_max_adj = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    rng = random.Random(2024)
+    
+    tamanos = [n for n in (3, 5, 9, 12, 15, 20, 25, 30, 35, 40, 50, 75, 100, 150, 200)
+               if n <= n_max]
+    
+    print(f"{'n':>5} {'gauss-jordan (ms)':>18} {'adjunta (ms)':>14} {'aceleración':>12}")
+    print("-" * 52)
+    for n in tamanos:
+        M = matriz_invertible_aleatoria(n, rng)
+        t_gj, inv_gj = medir(inverse_matrix_mod, M, repeticiones=3)
+        
+        if n <= n_max_adj:
+            t_adj, inv_adj = medir(inverse_matrix_mod_adjugate, M)
+            if inv_adj != inv_gj:
+                raise AssertionError(f"Las inversas difieren para n={n}")
+            print(f"{n:>5} {t_gj * 1e3:>18.2f} {t_adj * 1e3:>14.2f} {t_adj / t_gj:>11.1f}x")
+        else:
+            print(f"{n:>5} {t_gj * 1e3:>18.2f} {'-':>14} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark de la generación de claves a partir de funciones.
+
+Uso:
+    python bench_keys.py
+
+Compara get_matrix_from_function llamada función por función con
+matrices_desde_funciones sobre el lote completo.
+"""
+
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from logic.math_utils import get_matrix_from_function, matrices_desde_funciones
+
+
+def main():
+    rng = np.random.default_rng(22)
+    print(f"{'k':>8} {'n':>4} {'una a una (ms)':>15} {'lote (ms)':>10} {'claves/s (lote)':>16} {'aceleración':>12}")
+    print("-" * 70)
+    for k, n in ((10**3, 3), (10**4, 3), (10**3, 9), (10**4, 9), (10**5, 9), (10**3, 30)):
+        funciones = rng.integers(0, n, size=(k, n))
+        filas = funciones.tolist()
+        
+        muestra = filas[:min(k, 2000)]
+        inicio = time.perf_counter()
+        for f in muestra:
+            get_matrix_from_function(f)
+        t_una = (time.perf_counter() - inicio) * k / len(muestra)
+        
+        inicio = time.perf_counter()
+        matrices_desde_funciones(funciones)
+        t_lote = time.perf_counter() - inicio
+        
+        print(f"{k:>8,} {n:>4} {t_una * 1e3:>15.1f} {t_lote * 1e3:>10.1f} "
+              f"{k / t_lote:>16,.0f} {t_una / t_lote:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
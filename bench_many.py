@@ -0,0 +1,55 @@
+"""
+Benchmark del cifrado de muchos mensajes cortos con la misma clave.
+
+Compara CryptoEngine.encrypt / decrypt llamados mensaje por mensaje con
+encrypt_many / decrypt_many sobre la lista completa.
+
+Uso:
+    python bench_many.py [mensajes] [largo_max]
+"""
+
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from logic import CryptoEngine
+from logic.crypto_logic import ALPHABET
+
+
+def cronometrar(fn, *args):
+    """Retorna (segundos, resultado) de una llamada a fn(*args)."""
+    inicio = time.perf_counter()
+    resultado = fn(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    largo_max = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    rng = random.Random(24)
+    simbolos = ''.join(ALPHABET)
+    mensajes = [''.join(rng.choice(simbolos) for _ in range(rng.randint(1, largo_max)))
+                for _ in range(cantidad)]
+    
+    print(f"{cantidad:,} mensajes de 1 a {largo_max} caracteres")
+    print(f"{'n':>3} {'operación':>10} {'uno a uno (s)':>14} {'lote (s)':>9} {'mensajes/s (lote)':>18} {'aceleración':>12}")
+    print("-" * 71)
+    for n in (3, 9, 20):
+        ce = CryptoEngine(n)
+        ce.set_key_from_function([(5 * i + 2) % n for i in range(n)])
+        
+        t_uno, cifrados = cronometrar(lambda: [ce.encrypt(m) for m in mensajes])
+        t_lote, cifrados_lote = cronometrar(ce.encrypt_many, mensajes)
+        assert cifrados_lote == cifrados
+        print(f"{n:>3} {'encrypt':>10} {t_uno:>14.2f} {t_lote:>9.2f} {cantidad / t_lote:>18,.0f} {t_uno / t_lote:>11.1f}x")
+        
+        t_uno, planos = cronometrar(lambda: [ce.decrypt(c) for c in cifrados])
+        t_lote, planos_lote = cronometrar(ce.decrypt_many, cifrados)
+        assert planos_lote == planos
+        print(f"{n:>3} {'decrypt':>10} {t_uno:>14.2f} {t_lote:>9.2f} {cantidad / t_lote:>18,.0f} {t_uno / t_lote:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,8 @@ Permite al usuario ingresar una función y visualizar el árbol resultante, con
 """
 
 import customtkinter as ctk
-import random
 from gui.graph_canvas import GraphCanvas
-from logic import GraphLogic, CryptoEngine
+from logic import GraphLogic, CryptoEngine, FunctionSampler
 
 
 class FunctionView(ctk.CTkFrame):
@@ -18,6 +17,7 @@ class FunctionView(ctk.CTkFrame):
         self.n = n
         self.graph_logic = GraphLogic(n)
         self.crypto_engine = CryptoEngine(n)
+        self.sampler = FunctionSampler(n)
         self.on_back = on_back
         
         # Estado
@@ -183,36 +183,38 @@ class FunctionView(ctk.CTkFrame):
         
         try:
             valores = [int(x.strip()) for x in texto.split(',')]
-            
-            if len(valores) != self.n:
-                self.lbl_error.configure(text=f"Debe ingresar exactamente {self.n} valores")
-                return
-            
-            if not all(1 <= x <= self.n for x in valores):
-                self.lbl_error.configure(text=f"Los valores deben estar entre 1 y {self.n}")
-                return
-            
-            # Convertir a índices 0-(n-1)
-            self.funcion = [v - 1 for v in valores]
-            
-            # Construir árbol
-            result = self.graph_logic.construir_arbol_desde_funcion(self.funcion)
-            
-            self.camino_vertebra = result['camino_vertebra']
-            self.camino_orden = result['camino_orden']
-            self.camino_inv = result['camino_inv']
-            self.aristas_vert = result['aristas_vert']
-            self.aristas_dir = result['aristas_dir']
-            
-            self.estado = 1  # Mostrar bosque
-            
-            self.lbl_error.configure(text="")
-            self.btn_construir.configure(text="Convertir a Árbol", command=self._convertir_arbol)
-            
-            self._update_display()
-            
         except ValueError:
             self.lbl_error.configure(text="Formato inválido. Use números separados por comas")
+            return
+        
+        if len(valores) != self.n:
+            self.lbl_error.configure(text=f"Debe ingresar exactamente {self.n} valores")
+            return
+        
+        if not all(1 <= x <= self.n for x in valores):
+            self.lbl_error.configure(text=f"Los valores deben estar entre 1 y {self.n}")
+            return
+        
+        # Convertir a índices 0-(n-1)
+        self._mostrar_bosque([v - 1 for v in valores])
+    
+    def _mostrar_bosque(self, funcion):
+        """Construye el árbol de una función (índices 0-(n-1)) y muestra su bosque."""
+        self.funcion = funcion
+        result = self.graph_logic.construir_arbol_desde_funcion(self.funcion)
+        
+        self.camino_vertebra = result['camino_vertebra']
+        self.camino_orden = result['camino_orden']
+        self.camino_inv = result['camino_inv']
+        self.aristas_vert = result['aristas_vert']
+        self.aristas_dir = result['aristas_dir']
+        
+        self.estado = 1  # Mostrar bosque
+        
+        self.lbl_error.configure(text="")
+        self.btn_construir.configure(text="Convertir a Árbol", command=self._convertir_arbol)
+        
+        self._update_display()
     
     def _convertir_arbol(self):
         """Convierte el bosque en árbol."""
@@ -382,15 +384,12 @@ class FunctionView(ctk.CTkFrame):
     
     def _generar_funcion_aleatoria(self):
         """Genera una función aleatoria con n valores."""
-        # Generar función aleatoria (cada valor puede ser de 1 a n)
-        funcion_aleatoria = [random.randint(1, self.n) for _ in range(self.n)]
+        funcion = self.sampler.funcion()
         
-        # Colocar en el entry
+        # Mostrar en el entry (valores de 1 a n) y construir sin volver a parsear
         self.entry_funcion.delete(0, "end")
-        self.entry_funcion.insert(0, ",".join(map(str, funcion_aleatoria)))
-        
-        # Construir automáticamente
-        self._construir_bosque()
+        self.entry_funcion.insert(0, ",".join(str(v + 1) for v in funcion))
+        self._mostrar_bosque(funcion)
     
     def _reset(self):
         """Reinicia la vista."""
@@ -7,6 +7,8 @@ import math
 import tkinter as tk
 from tkinter import Canvas
 
+from logic.graph_logic import arista_normalizada, indice_aristas
+
 
 class GraphCanvas(Canvas):
     """Canvas especializado para dibujar grafos de manera elegante."""
@@ -249,22 +251,19 @@ class GraphCanvas(Canvas):
             tags=f"label_{vertex}"
         )
     
-    def draw_graph_tree(self, aristas, aristas_vert=None, aristas_dir=None, funcion=None):
-        """Dibuja un grafo completo con todas sus componentes."""
+    def draw_graph_tree(self, aristas, aristas_vert=None, aristas_dir=None, funcion=None, indice_vert=None):
+        """
+        Dibuja un grafo completo con todas sus componentes.
+        indice_vert es el índice de aristas_vert que entrega GraphLogic, si se tiene.
+        """
         self.clear_graph()
         
-        # Primero dibujar aristas simples
+        # Primero dibujar aristas simples (las de la vértebra se dibujan aparte)
         if aristas:
+            if indice_vert is None:
+                indice_vert = indice_aristas(aristas_vert or [])
             for v1, v2 in aristas:
-                # Verificar si es parte de la vértebra
-                is_vertebra = False
-                if aristas_vert:
-                    for a, b in aristas_vert:
-                        if (v1 == a and v2 == b) or (v1 == b and v2 == a):
-                            is_vertebra = True
-                            break
-                
-                if not is_vertebra:
+                if arista_normalizada(v1, v2) not in indice_vert:
                     self.draw_edge(v1, v2)
         
         # Luego vértebras
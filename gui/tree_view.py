@@ -4,7 +4,6 @@ Permite al usuario construir un árbol y generar una función, con opción de de
 """
 
 import customtkinter as ctk
-import random
 from gui.graph_canvas import GraphCanvas
 from logic import GraphLogic, CryptoEngine
 
@@ -29,6 +28,7 @@ class TreeView(ctk.CTkFrame):
         self.camino_orden = None
         self.camino_inv = None
         self.aristas_vert = []
+        self.indice_vert = frozenset()
         self.aristas_dir = []
         self.estado = 0  # 0: conectar, 1: error ciclo, 2: elegir inicio, 3: elegir fin, 4: listo
         self.modo_desencriptar = False
@@ -156,7 +156,7 @@ class TreeView(ctk.CTkFrame):
             return
         
         # Fase 1: Conectar árbol
-        if not self.graph_logic.grafoconexo():
+        if not self.graph_logic.is_connected:
             if self.vertice_1 is None:
                 self.vertice_1 = vertex
             else:
@@ -170,7 +170,8 @@ class TreeView(ctk.CTkFrame):
                 
                 self.vertice_1 = None
             
-            if self.graph_logic.grafoconexo() and len(self.graph_logic.aristas) == 8:
+            # Sin ciclos, ser conexo equivale a tener las n-1 aristas del árbol
+            if self.graph_logic.is_connected:
                 self.estado = 2  # Listo para elegir inicio
         
         # Fase 2: Elegir vértice inicial
@@ -197,6 +198,7 @@ class TreeView(ctk.CTkFrame):
         self.camino_orden = result['camino_orden']
         self.camino_inv = result['camino_inv']
         self.aristas_vert = result['aristas_vert']
+        self.indice_vert = result['indice_vert']
         self.aristas_dir = result['aristas_dir']
         
         # Configurar clave de encriptación
@@ -215,7 +217,8 @@ class TreeView(ctk.CTkFrame):
                 self.graph_logic.aristas,
                 self.aristas_vert,
                 self.aristas_dir,
-                None
+                None,
+                self.indice_vert
             )
         
         # Actualizar mensaje de estado
@@ -409,40 +412,8 @@ class TreeView(ctk.CTkFrame):
         # Resetear primero
         self._reset()
         
-        # Usar algoritmo de Prüfer para generar un árbol aleatorio
-        # Generar secuencia de Prüfer (n-2 números entre 0 y n-1)
-        if self.n == 1:
-            self.estado = 2  # Solo un vértice, ya está listo
-            self._update_display()
-            return
-        
-        # Para n=2, solo hay una arista posible
-        if self.n == 2:
-            self.graph_logic.agregar_arista(0, 1)
-            self.estado = 2
-            self._update_display()
-            return
-        
-        # Para n >= 3, usar algoritmo de Kruskal aleatorio
-        vertices = list(range(self.n))
-        aristas_posibles = []
-        
-        # Generar todas las aristas posibles
-        for i in range(self.n):
-            for j in range(i + 1, self.n):
-                aristas_posibles.append((i, j))
-        
-        # Barajar las aristas
-        random.shuffle(aristas_posibles)
-        
-        # Agregar aristas hasta tener n-1 (árbol completo)
-        aristas_agregadas = 0
-        for v1, v2 in aristas_posibles:
-            if aristas_agregadas == self.n - 1:
-                break
-            
-            if self.graph_logic.agregar_arista(v1, v2):
-                aristas_agregadas += 1
+        # Árbol uniforme a partir de una secuencia de Prüfer aleatoria
+        self.graph_logic.generar_arbol_aleatorio()
         
         # Cambiar a fase de elegir vértices
         self.estado = 2
@@ -461,6 +432,7 @@ class TreeView(ctk.CTkFrame):
         self.camino_orden = None
         self.camino_inv = None
         self.aristas_vert = []
+        self.indice_vert = frozenset()
         self.aristas_dir = []
         self.estado = 0
         self.modo_desencriptar = False
@@ -5,5 +5,6 @@ Módulo de inicialización del paquete logic.
 from logic.graph_logic import GraphLogic
 from logic.crypto_logic import CryptoEngine
 from logic.math_utils import get_matrix_from_function
+from logic.sampler import FunctionSampler
 
-__all__ = ['GraphLogic', 'CryptoEngine', 'get_matrix_from_function']
+__all__ = ['GraphLogic', 'CryptoEngine', 'FunctionSampler', 'get_matrix_from_function']
@@ -0,0 +1,208 @@
+"""
+Criptoanálisis del cifrado Hill de logic.crypto_logic.
+
+Dos ataques, útiles como prueba de carga de las primitivas y como chequeo de
+seguridad de las claves de get_matrix_from_function:
+
+    Texto plano conocido: cada bloque cumple c = K·p (mod 30), así que con
+    suficientes pares de bloques la clave sale de un sistema lineal que se
+    resuelve en cada GF(p) y se recombina con el CRT.
+    
+    Fuerza bruta: para n pequeño recorre las n^n funciones, repartidas por
+    rangos entre varios procesos, y se queda con las claves que descifran el
+    texto en un mensaje con formato válido (longitud embebida coherente y
+    relleno de espacios) y, si se da, que empieza con un fragmento conocido.
+
+Uso:
+    python -m logic.cryptanalysis n archivo_cifrado [--fragmento F] [--procesos P] [--shard S]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from logic.crypto_logic import ALPHABET, MOD, _encode_array, decrypt_text, text_to_numbers
+from logic.math_utils import claves_como_bytes, inversas_mod_lote, matrices_desde_funciones, resolver_sistema_mod
+from logic.parallel import ejecutar_rangos, linea_progreso
+from logic.ranking import funciones_desde_indices
+
+
+# Número máximo de funciones candidatas que se reportan
+MAX_ACIERTOS = 20
+
+
+def recuperar_clave_numeros(planos, cifrados, block_size, MOD=MOD):
+    """
+    Recupera la clave a partir de números planos y cifrados alineados por bloques.
+    Retorna la clave como lista de listas, o None si los bloques no la determinan.
+    """
+    P = np.asarray(planos, dtype=np.int64)
+    C = np.asarray(cifrados, dtype=np.int64)
+    bloques = min(len(P), len(C)) // block_size
+    P = P[:bloques * block_size].reshape(bloques, block_size)
+    C = C[:bloques * block_size].reshape(bloques, block_size)
+    if bloques < block_size:
+        return None
+    
+    # C = P·Kᵀ, así que la solución del sistema es la clave transpuesta
+    Kt = resolver_sistema_mod(P, C, MOD)
+    return None if Kt is None else np.array(Kt, dtype=np.int64).T.tolist()
+
+
+def recuperar_clave(texto_plano, texto_cifrado, block_size):
+    """
+    Recupera la clave de un par (texto plano, texto cifrado) de encrypt_text.
+    Retorna la clave como lista de listas, o None si el mensaje es demasiado
+    corto o repetitivo para determinarla.
+    """
+    return recuperar_clave_numeros(_encode_array(texto_plano, block_size), text_to_numbers(texto_cifrado), block_size)
+
+
+def _claves_distintas(claves, MOD=MOD):
+    """
+    Agrupa un lote de claves (k × n × n) iguales.
+    Retorna (unicas, grupo) con claves[t] == unicas[grupo[t]].
+    """
+    _, primeras, grupo = np.unique(claves_como_bytes(claves, MOD), return_index=True, return_inverse=True)
+    return claves[primeras], grupo.ravel()
+
+
+def _mensajes_validos(invs, cifrado, block_size, fragmento, MOD=MOD):
+    """
+    Marca las claves inversas (k × b × b) que descifran el cifrado en un mensaje válido.
+    Solo descifra los bloques de la cabecera (longitud y fragmento) y el último
+    bloque, que es donde puede estar el relleno; eso basta para decidir.
+    """
+    b = block_size
+    N = len(cifrado)
+    C = cifrado.reshape(-1, b)
+    
+    h = min(-(-(2 + len(fragmento)) // b), len(C))
+    cabeza = np.einsum('kij,mj->kmi', invs, C[:h]).reshape(len(invs), -1) % MOD
+    L = cabeza[:, 0] * MOD + cabeza[:, 1]
+    validos = -(-(L + 2) // b) * b == N
+    
+    fin = np.einsum('kij,j->ki', invs, C[-1]) % MOD
+    relleno = np.arange(N - b, N) >= (L + 2)[:, np.newaxis]
+    validos &= ((fin == ALPHABET[' ']) | ~relleno).all(axis=1)
+    
+    # La cabecera cubre todo el fragmento salvo que el mensaje sea más corto
+    validos &= L >= len(fragmento)
+    m = min(len(fragmento), h * b - 2)
+    if m:
+        validos &= (cabeza[:, 2:m + 2] == fragmento[:m]).all(axis=1)
+    return validos
+
+
+def buscar_rango(texto_cifrado, n, inicio, fin, fragmento="", lote=1 << 14):
+    """
+    Prueba las funciones con índice en [inicio, fin) como origen de la clave.
+    
+    Retorna un diccionario con el número de funciones probadas, el de
+    aciertos y los primeros MAX_ACIERTOS como pares (índice, texto descifrado).
+    """
+    cifrado = text_to_numbers(texto_cifrado)
+    if len(cifrado) % n != 0 or len(cifrado) < 2:
+        raise ValueError("Invalid ciphertext length (must be multiple of block size).")
+    frag = text_to_numbers(fragmento)
+    
+    probadas = total_aciertos = 0
+    aciertos = []
+    for a in range(inicio, fin, lote):
+        indices = np.arange(a, min(a + lote, fin), dtype=np.int64)
+        claves, _ = matrices_desde_funciones(funciones_desde_indices(indices, n), MOD)
+        
+        # Muchas funciones comparten clave: se prueba cada clave distinta una vez
+        unicas, grupo = _claves_distintas(claves, MOD)
+        invs, invertibles = inversas_mod_lote(unicas, MOD)
+        validas = invertibles & _mensajes_validos(invs, cifrado, n, frag)
+        validos = np.flatnonzero(validas[grupo])
+        probadas += len(indices)
+        total_aciertos += len(validos)
+        
+        # Solo los que se reportan se descifran completos
+        for t in validos[:MAX_ACIERTOS - len(aciertos)]:
+            aciertos.append((int(indices[t]), decrypt_text(texto_cifrado, claves[t], n, invs[grupo[t]])))
+    
+    return {'probadas': probadas, 'total_aciertos': total_aciertos, 'aciertos': aciertos}
+
+
+def fuerza_bruta(texto_cifrado, n, fragmento="", procesos=None, shard=1 << 16, progreso=None):
+    """
+    Busca por fuerza bruta las funciones de tamaño n cuya clave descifra el texto.
+    
+    Args:
+        texto_cifrado: Texto cifrado con un CryptoEngine de tamaño n
+        n: Tamaño de la función (y del bloque)
+        fragmento: Comienzo conocido del texto plano (opcional)
+        procesos: Procesos de trabajo para ejecutar_rangos
+        shard: Funciones candidatas por rango
+        progreso: Recibe una línea de progreso por cada rango terminado
+    """
+    total = n ** n
+    num_shards = -(-total // shard)
+    inicio_t = time.perf_counter()
+    probadas = total_aciertos = 0
+    aciertos = []
+    hechos = 0
+    
+    def registrar(s, resultado):
+        nonlocal probadas, total_aciertos, hechos
+        probadas += resultado['probadas']
+        total_aciertos += resultado['total_aciertos']
+        aciertos.extend(resultado['aciertos'])
+        hechos += 1
+        if progreso:
+            transcurrido = time.perf_counter() - inicio_t
+            progreso(linea_progreso(hechos, num_shards, "{:,} candidatos/s  {} aciertos".format(
+                int(probadas / transcurrido) if transcurrido > 0 else 0, total_aciertos)))
+    
+    rangos = ((s, (texto_cifrado, n, s * shard, min((s + 1) * shard, total), fragmento)) for s in range(num_shards))
+    ejecutar_rangos(buscar_rango, rangos, procesos, registrar)
+    
+    segundos = time.perf_counter() - inicio_t
+    aciertos.sort()
+    return {
+        'n': n,
+        'total': total,
+        'probadas': probadas,
+        'total_aciertos': total_aciertos,
+        'aciertos': aciertos[:MAX_ACIERTOS],
+        'segundos': segundos,
+        'candidatos_por_segundo': probadas / segundos if segundos > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Busca por fuerza bruta la función que originó la clave de un texto cifrado.")
+    parser.add_argument('n', type=int, help="tamaño de la función (y del bloque)")
+    parser.add_argument('archivo', help="archivo con el texto cifrado")
+    parser.add_argument('--fragmento', default="", help="comienzo conocido del texto plano")
+    parser.add_argument('--procesos', type=int, default=None, help="procesos de trabajo (default: todos los núcleos)")
+    parser.add_argument('--shard', type=int, default=1 << 16, help="funciones por rango de trabajo")
+    args = parser.parse_args(argv)
+    
+    with open(args.archivo, encoding='utf-8') as fh:
+        texto_cifrado = fh.read().rstrip('\n')
+    
+    n = args.n
+    print(f"Probando {n ** n:,} funciones para n = {n}\n")
+    r = fuerza_bruta(texto_cifrado, n, args.fragmento, args.procesos, args.shard, progreso=print)
+    
+    print()
+    print(f"  Funciones probadas: {r['probadas']:,} en {r['segundos']:.2f} s "
+          f"({r['candidatos_por_segundo']:,.0f} candidatos/s)")
+    if not r['aciertos']:
+        print("  Ninguna clave produce un mensaje válido.")
+        return 1
+    print(f"  Funciones cuya clave da un mensaje válido: {r['total_aciertos']:,}")
+    for indice, texto in r['aciertos']:
+        print(f"  {indice:>12,}  {texto!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,11 @@ Módulo de lógica de criptografía.
 Implementa el cifrado Hill Cipher de n×n con alfabeto extendido.
 """
 
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+
 from logic.math_utils import mat_mul_vec_nxn, inverse_matrix_mod, get_matrix_from_function
 
 
@@ -17,6 +22,9 @@ REV_ALPH = {v: k for k, v in ALPHABET.items()}
 
 MOD = 30
 
+# Longitud máxima de un mensaje (o trama) con la longitud embebida en dos dígitos base 30
+MAX_TEXT_LEN = MOD * MOD - 1
+
 
 def char_a_num(ch):
     """Convierte un carácter a número."""
@@ -34,26 +42,56 @@ def num_a_char(n):
     return REV_ALPH.get(n, ' ')
 
 
+# Tablas precompiladas para convertir textos completos en C.
+# Texto → números: str.translate lleva cada carácter del alfabeto (y su minúscula)
+# al código 0..29; cualquier otro carácter queda con código >= 30 y se lleva
+# a 29 (espacio) con np.minimum. 'ı' y 'ſ' se incluyen porque su .upper()
+# es 'I' y 'S', igual que en char_a_num.
+_TABLA_A_NUM = {c: chr(ALPHABET[' ']) for c in range(MOD)}
+for _ch, _v in ALPHABET.items():
+    _TABLA_A_NUM[ord(_ch)] = chr(_v)
+    _TABLA_A_NUM[ord(_ch.lower())] = chr(_v)
+_TABLA_A_NUM[ord('ı')] = chr(ALPHABET['I'])
+_TABLA_A_NUM[ord('ſ')] = chr(ALPHABET['S'])
+
+# Números → texto: el alfabeto cabe en latin-1, así que basta un arreglo de bytes
+_TABLA_A_CHAR = np.frombuffer(
+    ''.join(REV_ALPH[i] for i in range(MOD)).encode('latin-1'), dtype=np.uint8
+)
+
+
+def text_to_numbers(text):
+    """Convierte un texto completo a un arreglo de números (equivale a char_a_num por carácter)."""
+    codigos = np.frombuffer(text.translate(_TABLA_A_NUM).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    return np.minimum(codigos, ALPHABET[' ']).astype(np.int64)
+
+
+def numbers_to_text(nums):
+    """Convierte una secuencia de números a texto (equivale a num_a_char por número)."""
+    idx = np.asarray(nums, dtype=np.int64) % MOD
+    return _TABLA_A_CHAR[idx].tobytes().decode('latin-1')
+
+
+def _encode_array(text, block_size):
+    """Versión de encode_text_to_numbers que retorna un arreglo de NumPy."""
+    L = len(text)
+    if L > MAX_TEXT_LEN:
+        raise ValueError("Text too long (max {} characters).".format(MAX_TEXT_LEN))
+    
+    total = -(-(L + 2) // block_size) * block_size
+    nums = np.full(total, ALPHABET[' '], dtype=np.int64)
+    nums[0] = L // MOD
+    nums[1] = L % MOD
+    nums[2:L + 2] = text_to_numbers(text)
+    return nums
+
+
 def encode_text_to_numbers(text, block_size):
     """
     Codifica texto a números con longitud embebida.
     Formato: [high, low, ...chars...] con padding a múltiplo de block_size.
     """
-    L = len(text)
-    if L > 30 * 30 - 1:
-        raise ValueError("Text too long (max 899 characters).")
-    
-    high = L // MOD
-    low = L % MOD
-    nums = [high, low]
-    
-    for ch in text:
-        nums.append(char_a_num(ch))
-    
-    while len(nums) % block_size != 0:
-        nums.append(ALPHABET[' '])
-    
-    return nums
+    return _encode_array(text, block_size).tolist()
 
 
 def decode_numbers_to_text(nums):
@@ -61,66 +99,328 @@ def decode_numbers_to_text(nums):
     if len(nums) < 2:
         return ""
     
-    high, low = nums[0], nums[1]
-    L = high * MOD + low
-    chars = []
-    pos = 2
-    needed = L
+    L = int(nums[0]) * MOD + int(nums[1])
+    return numbers_to_text(nums[2:L + 2])
+
+
+def hill_apply_blocks(nums, M, block_size, MOD=30):
+    """
+    Aplica la matriz M a todos los bloques completos de nums en un solo producto.
     
-    while needed > 0 and pos < len(nums):
-        chars.append(num_a_char(nums[pos]))
-        pos += 1
-        needed -= 1
+    nums se reorganiza como un arreglo (bloques × block_size) y se multiplica
+    por M transpuesta módulo MOD. Retorna un arreglo de NumPy plano; la
+    longitud de nums debe ser múltiplo de block_size.
+    """
+    arr = np.asarray(nums, dtype=np.int64) % MOD
+    if arr.size % block_size != 0:
+        raise ValueError("Length must be a multiple of block size.")
     
-    return ''.join(chars)
+    K = np.asarray(M, dtype=np.int64)[:block_size, :block_size] % MOD
+    bloques = arr.reshape(-1, block_size)
+    return ((bloques @ K.T) % MOD).ravel()
 
 
-def hill_encrypt_numbers(nums, key, block_size, MOD=30):
-    """Encripta números usando cifrado Hill."""
-    out = []
+def _hill_numbers(nums, M, block_size, MOD):
+    """Cifra nums por bloques con M; un bloque final incompleto usa la submatriz superior."""
+    completos = len(nums) - len(nums) % block_size
+    out = hill_apply_blocks(nums[:completos], M, block_size, MOD).tolist()
     
-    for i in range(0, len(nums), block_size):
-        block = nums[i:i + block_size]
-        v = mat_mul_vec_nxn(key, block, MOD)
-        out.extend(v)
+    if completos < len(nums):
+        out.extend(mat_mul_vec_nxn(M, nums[completos:], MOD))
     
     return out
 
 
-def hill_decrypt_numbers(nums, key, block_size, MOD=30):
-    """Desencripta números usando cifrado Hill."""
-    inv = inverse_matrix_mod(key, MOD)
+def hill_encrypt_numbers(nums, key, block_size, MOD=30):
+    """Encripta números usando cifrado Hill."""
+    return _hill_numbers(nums, key, block_size, MOD)
+
+
+def _inversa_de_clave(key, inv=None, MOD=30):
+    """Retorna inv si ya se conoce; si no, calcula la inversa de la clave módulo MOD."""
     if inv is None:
-        raise ValueError("Key not invertible modulo {}".format(MOD))
-    
-    out = []
-    
-    for i in range(0, len(nums), block_size):
-        block = nums[i:i + block_size]
-        v = mat_mul_vec_nxn(inv, block, MOD)
-        out.extend(v)
-    
-    return out
+        inv = inverse_matrix_mod(key, MOD)
+        if inv is None:
+            raise ValueError("Key not invertible modulo {}".format(MOD))
+    return inv
+
+
+def hill_decrypt_numbers(nums, key, block_size, MOD=30, inv=None):
+    """
+    Desencripta números usando cifrado Hill.
+    Si se pasa inv (la inversa de key), no se recalcula.
+    """
+    inv = _inversa_de_clave(key, inv, MOD)
+    return _hill_numbers(nums, inv, block_size, MOD)
 
 
 def encrypt_text(plain, key, block_size):
     """Encripta texto plano usando una clave matricial."""
-    nums = encode_text_to_numbers(plain, block_size)
-    enc_nums = hill_encrypt_numbers(nums, key, block_size, MOD)
-    return ''.join(num_a_char(n) for n in enc_nums)
+    nums = _encode_array(plain, block_size)
+    return numbers_to_text(hill_apply_blocks(nums, key, block_size, MOD))
 
 
-def decrypt_text(ciphertext, key, block_size):
-    """Desencripta texto cifrado usando una clave matricial."""
-    nums = [char_a_num(ch) for ch in ciphertext]
+def decrypt_text(ciphertext, key, block_size, inv=None):
+    """Desencripta texto cifrado usando una clave matricial (y su inversa, si ya se conoce)."""
+    nums = text_to_numbers(ciphertext)
     
     if len(nums) % block_size != 0:
         raise ValueError("Invalid ciphertext length (must be multiple of block size).")
     
-    dec_nums = hill_decrypt_numbers(nums, key, block_size, MOD)
+    dec_nums = hill_decrypt_numbers(nums, key, block_size, MOD, inv)
     return decode_numbers_to_text(dec_nums)
 
 
+def _empaquetar(textos, block_size):
+    """
+    Codifica varios mensajes en un solo arreglo, uno tras otro, cada uno con
+    el formato de _encode_array. Retorna (nums, inicios, tamanos).
+    """
+    largos = np.fromiter(map(len, textos), dtype=np.int64, count=len(textos))
+    if largos.size and largos.max() > MAX_TEXT_LEN:
+        raise ValueError("Text too long (max {} characters).".format(MAX_TEXT_LEN))
+    
+    tamanos = -(-(largos + 2) // block_size) * block_size
+    inicios = np.cumsum(tamanos) - tamanos
+    nums = np.full(int(tamanos.sum()), ALPHABET[' '], dtype=np.int64)
+    nums[inicios] = largos // MOD
+    nums[inicios + 1] = largos % MOD
+    
+    # El carácter j del mensaje i va en inicios[i] + 2 + j
+    codigos = text_to_numbers(''.join(textos))
+    desplazamiento = inicios + 2 - (np.cumsum(largos) - largos)
+    nums[np.repeat(desplazamiento, largos) + np.arange(codigos.size)] = codigos
+    return nums, inicios, tamanos
+
+
+def encrypt_texts(textos, key, block_size):
+    """
+    Encripta una lista de mensajes con la misma clave (equivale a encrypt_text por mensaje).
+    
+    Todos los mensajes se codifican en un único arreglo y se cifran con un
+    solo producto de matrices; el resultado se corta de nuevo por mensaje.
+    """
+    nums, inicios, tamanos = _empaquetar(textos, block_size)
+    cifrado = numbers_to_text(hill_apply_blocks(nums, key, block_size, MOD))
+    return [cifrado[i:i + t] for i, t in zip(inicios.tolist(), tamanos.tolist())]
+
+
+def decrypt_texts(cifrados, key, block_size, inv=None):
+    """
+    Desencripta una lista de textos cifrados con la misma clave (equivale a decrypt_text por texto).
+    
+    Descifra todos los bloques con un solo producto de matrices y lee la
+    longitud embebida de cada mensaje de forma vectorizada.
+    """
+    tamanos = np.fromiter(map(len, cifrados), dtype=np.int64, count=len(cifrados))
+    if (tamanos % block_size).any():
+        raise ValueError("Invalid ciphertext length (must be multiple of block size).")
+    
+    inv = _inversa_de_clave(key, inv, MOD)
+    nums = hill_apply_blocks(text_to_numbers(''.join(cifrados)), inv, block_size, MOD)
+    plano = numbers_to_text(nums)
+    
+    # Longitud embebida de cada mensaje, sin pasar del final de su tramo
+    inicios = np.cumsum(tamanos) - tamanos
+    con_cabecera = tamanos >= 2
+    largos = np.zeros(len(cifrados), dtype=np.int64)
+    cab = inicios[con_cabecera]
+    largos[con_cabecera] = np.minimum(nums[cab] * MOD + nums[cab + 1], tamanos[con_cabecera] - 2)
+    return [plano[i + 2:i + 2 + L] for i, L in zip(inicios.tolist(), largos.tolist())]
+
+
+def _iter_piezas(source, size):
+    """Recorre un texto, un objeto tipo archivo o un iterable de cadenas por piezas."""
+    if hasattr(source, 'read'):
+        while True:
+            pieza = source.read(size)
+            if not pieza:
+                return
+            yield pieza
+    elif isinstance(source, str):
+        for i in range(0, len(source), size):
+            yield source[i:i + size]
+    else:
+        for pieza in source:
+            if pieza:
+                yield pieza
+
+
+def _iter_tramos(source, size):
+    """Reagrupa la entrada en tramos de exactamente size caracteres (el último puede ser menor)."""
+    resto = ''
+    for pieza in _iter_piezas(source, size):
+        buf = resto + pieza
+        pos = 0
+        while len(buf) - pos >= size:
+            yield buf[pos:pos + size]
+            pos += size
+        resto = buf[pos:]
+    
+    if resto:
+        yield resto
+
+
+def iter_encrypt_text(source, key, block_size):
+    """
+    Encripta una entrada de longitud arbitraria como una secuencia de tramas.
+    
+    Cada trama tiene el mismo formato que encrypt_text (longitud embebida,
+    hasta MAX_TEXT_LEN caracteres), por lo que un texto corto produce
+    exactamente el mismo cifrado que el modo de una sola llamada.
+    La memoria usada no depende de la longitud total de la entrada.
+    """
+    vacio = True
+    for tramo in _iter_tramos(source, MAX_TEXT_LEN):
+        vacio = False
+        yield encrypt_text(tramo, key, block_size)
+    
+    if vacio:
+        yield encrypt_text('', key, block_size)
+
+
+def iter_decrypt_text(source, key, block_size, inv=None):
+    """
+    Desencripta una secuencia de tramas producida por iter_encrypt_text.
+    
+    También acepta un cifrado de encrypt_text, que es una única trama.
+    """
+    inv = _inversa_de_clave(key, inv, MOD)
+    
+    def descifrar(bloques):
+        nums = text_to_numbers(''.join(b.ljust(block_size) for b in bloques))
+        return hill_apply_blocks(nums, inv, block_size, MOD).tolist()
+    
+    bloques = _iter_tramos(source, block_size)
+    while True:
+        # La cabecera (longitud en dos dígitos) puede ocupar más de un bloque si n = 1
+        nums = []
+        for bloque in bloques:
+            # Blancos que no pueden ser cifrado (bloque incompleto o con saltos de
+            # línea, como al final de un archivo): fin de la entrada
+            if not nums and not bloque.strip() and (len(bloque) < block_size or bloque.strip(' ')):
+                if any(b.strip() for b in bloques):
+                    raise ValueError("Truncated ciphertext stream.")
+                return
+            nums.extend(descifrar([bloque]))
+            if len(nums) >= 2:
+                break
+        
+        if not nums:
+            return
+        if len(nums) < 2:
+            raise ValueError("Truncated ciphertext stream.")
+        
+        L = nums[0] * MOD + nums[1]
+        total = -(-(L + 2) // block_size) * block_size
+        faltan = (total - len(nums)) // block_size
+        resto = list(islice(bloques, faltan))
+        if len(resto) < faltan:
+            raise ValueError("Truncated ciphertext stream.")
+        
+        if resto:
+            nums.extend(descifrar(resto))
+        yield decode_numbers_to_text(nums)
+
+
+class _EntradaClave:
+    """Clave cacheada junto con su inversa, que se calcula al primer uso."""
+    
+    def __init__(self, key, MOD):
+        self.key = key
+        self.MOD = MOD
+        self._inv_key = None
+    
+    @property
+    def inv_key(self):
+        if self._inv_key is None:
+            inv = np.array(_inversa_de_clave(self.key, None, self.MOD), dtype=np.int64)
+            inv.setflags(write=False)
+            self._inv_key = inv
+        return self._inv_key
+
+
+class KeyCache:
+    """
+    Caché LRU de claves (y sus inversas) derivadas de funciones.
+    
+    La llave es la función normalizada como tupla junto con MOD y dim, de modo
+    que funciones equivalentes para get_matrix_from_function comparten entrada.
+    Las matrices cacheadas son de solo lectura porque se comparten entre motores.
+    """
+    
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entradas = OrderedDict()
+    
+    @staticmethod
+    def _llave(funcion, MOD, dim):
+        if dim is None:
+            dim = len(funcion)
+        clean = [(0 if v is None else int(v)) for v in funcion]
+        return (tuple(clean[i % len(clean)] for i in range(dim)), MOD, dim)
+    
+    def lookup(self, funcion, MOD=30, dim=None):
+        """Retorna la entrada (clave e inversa perezosa) para la función."""
+        llave = self._llave(funcion, MOD, dim)
+        entrada = self._entradas.get(llave)
+        
+        if entrada is not None:
+            self.hits += 1
+            self._entradas.move_to_end(llave)
+            return entrada
+        
+        self.misses += 1
+        key = get_matrix_from_function(funcion, MOD, dim)
+        key.setflags(write=False)
+        entrada = _EntradaClave(key, MOD)
+        
+        if self.maxsize > 0:
+            self._entradas[llave] = entrada
+            while len(self._entradas) > self.maxsize:
+                self._entradas.popitem(last=False)
+        
+        return entrada
+    
+    def get_key(self, funcion, MOD=30, dim=None):
+        """Equivalente cacheado de get_matrix_from_function."""
+        return self.lookup(funcion, MOD, dim).key
+    
+    def get_inverse(self, funcion, MOD=30, dim=None):
+        """Inversa módulo MOD de la clave de la función, cacheada."""
+        return self.lookup(funcion, MOD, dim).inv_key
+    
+    def resize(self, maxsize):
+        """Cambia el tamaño máximo, descartando las entradas menos recientes."""
+        self.maxsize = maxsize
+        while len(self._entradas) > max(maxsize, 0):
+            self._entradas.popitem(last=False)
+    
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        self._entradas.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def info(self):
+        """Retorna un diccionario con aciertos, fallos, tamaño actual y máximo."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entradas),
+            'maxsize': self.maxsize,
+        }
+    
+    def __len__(self):
+        return len(self._entradas)
+
+
+# Caché compartida por todas las instancias de CryptoEngine
+KEY_CACHE = KeyCache()
+
+
 class CryptoEngine:
     """Motor de criptografía que maneja encriptación y desencriptación."""
     
@@ -131,12 +431,37 @@ class CryptoEngine:
         Args:
             n: Tamaño del bloque (igual al número de vértices)
         """
-        self.key = None
+        self._key = None
+        self._inv_key = None
+        self._entrada = None
         self.n = n
+    
+    @property
+    def key(self):
+        """Matriz clave del cifrado."""
+        return self._key
+    
+    @key.setter
+    def key(self, value):
+        self._key = value
+        self._inv_key = None
+        self._entrada = None
+    
+    @property
+    def inv_key(self):
+        """Inversa de la clave módulo MOD; se calcula una sola vez por clave."""
+        if self._inv_key is None and self._key is not None:
+            if self._entrada is not None:
+                self._inv_key = self._entrada.inv_key
+            else:
+                self._inv_key = np.array(_inversa_de_clave(self._key), dtype=np.int64)
+        return self._inv_key
         
     def set_key_from_function(self, funcion):
-        """Establece la clave a partir de una función."""
-        self.key = get_matrix_from_function(funcion)
+        """Establece la clave a partir de una función, usando la caché compartida KEY_CACHE."""
+        entrada = KEY_CACHE.lookup(funcion)
+        self.key = entrada.key
+        self._entrada = entrada
         
     def encrypt(self, plaintext):
         """Encripta texto plano."""
@@ -153,4 +478,62 @@ class CryptoEngine:
         while len(ciphertext) % self.n != 0:
             ciphertext += " "
         
-        return decrypt_text(ciphertext, self.key, self.n)
+        return decrypt_text(ciphertext, self.key, self.n, self.inv_key)
+    
+    def encrypt_many(self, mensajes):
+        """Encripta una lista de mensajes con un solo producto de matrices."""
+        if self.key is None:
+            raise ValueError("Key not set. Call set_key_from_function first.")
+        return encrypt_texts(mensajes, self.key, self.n)
+    
+    def decrypt_many(self, cifrados):
+        """Desencripta una lista de textos cifrados con un solo producto de matrices."""
+        if self.key is None:
+            raise ValueError("Key not set. Call set_key_from_function first.")
+        
+        # Igual que decrypt: completar cada texto a un múltiplo de n
+        cifrados = [c + " " * (-len(c) % self.n) for c in cifrados]
+        return decrypt_texts(cifrados, self.key, self.n, self.inv_key)
+    
+    def iter_encrypt(self, source):
+        """
+        Encripta por tramas un texto, un objeto tipo archivo o un iterable de cadenas.
+        Retorna un iterador de fragmentos cifrados.
+        """
+        if self.key is None:
+            raise ValueError("Key not set. Call set_key_from_function first.")
+        return iter_encrypt_text(source, self.key, self.n)
+    
+    def iter_decrypt(self, source):
+        """
+        Desencripta por tramas un texto, un objeto tipo archivo o un iterable de cadenas.
+        Retorna un iterador de fragmentos de texto plano.
+        """
+        if self.key is None:
+            raise ValueError("Key not set. Call set_key_from_function first.")
+        return iter_decrypt_text(source, self.key, self.n, self.inv_key)
+    
+    def encrypt_stream(self, source, dest):
+        """Encripta source y escribe el resultado en el objeto tipo archivo dest."""
+        for fragmento in self.iter_encrypt(source):
+            dest.write(fragmento)
+    
+    def decrypt_stream(self, source, dest):
+        """Desencripta source y escribe el resultado en el objeto tipo archivo dest."""
+        for fragmento in self.iter_decrypt(source):
+            dest.write(fragmento)
+    
+    def encrypt_file(self, entrada, salida, procesos=None):
+        """Encripta un archivo en paralelo por tramos (ver logic.file_cipher)."""
+        if self.key is None:
+            raise ValueError("Key not set. Call set_key_from_function first.")
+        # Importación local: logic.file_cipher depende de este módulo
+        from logic.file_cipher import encrypt_file
+        encrypt_file(entrada, salida, self.key, self.n, procesos)
+    
+    def decrypt_file(self, entrada, salida, procesos=None):
+        """Desencripta en paralelo un archivo de encrypt_file o encrypt_stream."""
+        if self.key is None:
+            raise ValueError("Key not set. Call set_key_from_function first.")
+        from logic.file_cipher import decrypt_file
+        decrypt_file(entrada, salida, self.key, self.n, procesos, self.inv_key)
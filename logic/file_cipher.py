@@ -0,0 +1,195 @@
+"""
+Cifrado de archivos grandes en paralelo.
+
+El archivo de entrada se mapea en memoria y se corta en tramos que contienen
+un número exacto de tramas (MAX_TEXT_LEN caracteres de texto plano, o una
+trama cifrada completa al descifrar), de modo que cada tramo se procesa por
+separado en un proceso de trabajo y los resultados se escriben en orden.
+El cifrado es idéntico byte a byte al de CryptoEngine.encrypt_stream, y
+decrypt_file acepta cualquier salida de encrypt_stream o encrypt_file.
+
+Uso:
+    python -m logic.file_cipher {cifrar,descifrar} entrada salida --funcion 0,3,1,... [--procesos P]
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+
+import numpy as np
+
+from logic.crypto_logic import (
+    MAX_TEXT_LEN,
+    MOD,
+    _inversa_de_clave,
+    decrypt_texts,
+    encrypt_text,
+    encrypt_texts,
+    hill_apply_blocks,
+    text_to_numbers,
+)
+from logic.math_utils import get_matrix_from_function
+from logic.parallel import ejecutar_en_orden
+
+
+# Tamaño aproximado (en bytes) de cada tramo de trabajo
+TAMANO_TRAMO = 1 << 22
+
+
+def _largo_trama_cifrada(block_size):
+    """Caracteres de una trama cifrada completa (MAX_TEXT_LEN caracteres de texto plano)."""
+    return -(-(MAX_TEXT_LEN + 2) // block_size) * block_size
+
+
+def _cortes(datos, unidad, objetivo):
+    """
+    Divide datos UTF-8 en rangos de bytes de unos objetivo bytes.
+    
+    Cada rango, salvo el último, tiene un múltiplo exacto de unidad
+    caracteres; los caracteres se cuentan por sus bytes iniciales.
+    Retorna una lista de pares (inicio, fin).
+    """
+    # Un carácter UTF-8 ocupa a lo sumo 4 bytes: así cada rango tiene al menos una unidad
+    objetivo = max(objetivo, 4 * (unidad + 1))
+    cortes = []
+    inicio = 0
+    while inicio < len(datos):
+        fin = inicio + objetivo
+        if fin < len(datos):
+            comienzos = np.flatnonzero((datos[inicio:fin] & 0xC0) != 0x80)
+            # El último carácter de la ventana puede estar cortado: no se cuenta
+            c = (len(comienzos) - 1) // unidad * unidad
+            fin = inicio + int(comienzos[c])
+        else:
+            fin = len(datos)
+        cortes.append((inicio, fin))
+        inicio = fin
+    return cortes
+
+
+def _leer_cortes(ruta, unidad, objetivo):
+    """Mapea el archivo en memoria y calcula sus cortes (lista vacía si está vacío)."""
+    if os.path.getsize(ruta) == 0:
+        return []
+    with open(ruta, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        datos = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            return _cortes(datos, unidad, objetivo)
+        finally:
+            del datos
+
+
+def _leer_tramo(ruta, inicio, fin):
+    """Lee y decodifica el rango [inicio, fin) del archivo a través de un mapa en memoria."""
+    with open(ruta, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[inicio:fin].decode('utf-8')
+
+
+def _cifrar_tramo(ruta, inicio, fin, key, block_size):
+    """Cifra un tramo del archivo; retorna el texto cifrado en bytes UTF-8."""
+    texto = _leer_tramo(ruta, inicio, fin)
+    tramas = [texto[i:i + MAX_TEXT_LEN] for i in range(0, len(texto), MAX_TEXT_LEN)]
+    return ''.join(encrypt_texts(tramas, key, block_size)).encode('utf-8')
+
+
+def _descifrar_tramo(ruta, inicio, fin, key, inv, block_size, ultimo):
+    """
+    Descifra un tramo del archivo; retorna el texto plano en bytes UTF-8.
+    Todas las tramas salvo la última del archivo deben estar completas.
+    """
+    texto = _leer_tramo(ruta, inicio, fin)
+    if ultimo:
+        # Como en iter_decrypt_text, los blancos finales que no pueden ser cifrado
+        # (saltos de línea, o un bloque incompleto de espacios) no son una trama
+        texto = texto.rstrip('\t\n\v\f\r')
+    largo = _largo_trama_cifrada(block_size)
+    tramas = [texto[i:i + largo] for i in range(0, len(texto), largo)]
+    if ultimo and tramas and not tramas[-1].strip() and len(tramas[-1]) < block_size:
+        tramas.pop()
+    
+    if tramas:
+        sin_relleno = len(tramas[-1])
+        tramas[-1] += ' ' * (-sin_relleno % block_size)
+        if ultimo:
+            # La longitud embebida de la última trama debe caber en lo que se leyó
+            nums = hill_apply_blocks(text_to_numbers(tramas[-1]), inv, block_size, MOD)
+            if len(nums) < 2 or nums[0] * MOD + nums[1] + 2 > sin_relleno:
+                raise ValueError("Truncated ciphertext stream.")
+    
+    planos = decrypt_texts(tramas, key, block_size, inv)
+    completas = planos[:-1] if ultimo else planos
+    if any(len(p) != MAX_TEXT_LEN for p in completas):
+        raise ValueError("Ciphertext frames are not regular; use decrypt_stream instead.")
+    return ''.join(planos).encode('utf-8')
+
+
+def encrypt_file(entrada, salida, key, block_size, procesos=None, tamano_tramo=TAMANO_TRAMO):
+    """
+    Cifra el archivo de texto entrada (UTF-8) y escribe el resultado en salida.
+    El archivo se lee tal cual, sin traducir los saltos de línea.
+    
+    Args:
+        entrada: Ruta del archivo de texto plano
+        salida: Ruta del archivo cifrado
+        key: Matriz clave
+        block_size: Tamaño de bloque
+        procesos: Procesos de trabajo, como en logic.parallel.ejecutar_en_orden
+        tamano_tramo: Bytes aproximados por tramo de trabajo
+    """
+    key = np.asarray(key, dtype=np.int64).tolist()
+    cortes = _leer_cortes(entrada, MAX_TEXT_LEN, tamano_tramo)
+    
+    with open(salida, 'wb') as dest:
+        if not cortes:
+            dest.write(encrypt_text('', key, block_size).encode('utf-8'))
+            return
+        tareas = ((entrada, a, b, key, block_size) for a, b in cortes)
+        for cifrado in ejecutar_en_orden(_cifrar_tramo, tareas, procesos):
+            dest.write(cifrado)
+
+
+def decrypt_file(entrada, salida, key, block_size, procesos=None, inv=None, tamano_tramo=TAMANO_TRAMO):
+    """
+    Descifra un archivo producido por encrypt_file (o encrypt_stream) y escribe el texto plano en salida.
+    Los argumentos son los de encrypt_file; inv es la inversa de la clave, si ya se conoce.
+    """
+    key = np.asarray(key, dtype=np.int64).tolist()
+    inv = np.asarray(_inversa_de_clave(key, inv, MOD), dtype=np.int64).tolist()
+    cortes = _leer_cortes(entrada, _largo_trama_cifrada(block_size), tamano_tramo)
+    
+    with open(salida, 'wb') as dest:
+        tareas = ((entrada, a, b, key, inv, block_size, i == len(cortes) - 1) for i, (a, b) in enumerate(cortes))
+        for plano in ejecutar_en_orden(_descifrar_tramo, tareas, procesos):
+            dest.write(plano)
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Cifra o descifra un archivo de texto en paralelo.")
+    parser.add_argument('modo', choices=['cifrar', 'descifrar'])
+    parser.add_argument('entrada', help="archivo de entrada")
+    parser.add_argument('salida', help="archivo de salida")
+    parser.add_argument('--funcion', required=True, help="función que genera la clave, como 0,3,1,... (índices desde 0)")
+    parser.add_argument('--procesos', type=int, default=None, help="procesos de trabajo (default: todos los núcleos)")
+    args = parser.parse_args(argv)
+    
+    funcion = [int(v) for v in args.funcion.split(',')]
+    n = len(funcion)
+    key = get_matrix_from_function(funcion)
+    
+    inicio = time.perf_counter()
+    if args.modo == 'cifrar':
+        encrypt_file(args.entrada, args.salida, key, n, args.procesos)
+    else:
+        decrypt_file(args.entrada, args.salida, key, n, args.procesos)
+    segundos = time.perf_counter() - inicio
+    
+    mb = os.path.getsize(args.entrada) / 1e6
+    print(f"{mb:.1f} MB en {segundos:.2f} s ({mb / segundos if segundos > 0 else 0:.1f} MB/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,87 @@ Módulo de lógica de grafos para la demostración de la Fórmula de Cayley.
 Contiene funciones para manipulación de grafos, árboles y vértebras.
 """
 
+from array import array
 from collections import deque
+from itertools import compress
+
+from logic.prufer import arbol_aleatorio
+
+
+def arista_normalizada(u, v):
+    """Representa la arista no dirigida {u, v} como la tupla (min, max)."""
+    return (u, v) if u <= v else (v, u)
+
+
+def indice_aristas(aristas):
+    """
+    Construye un índice de aristas no dirigidas para consultas de pertenencia en O(1).
+    El de la vértebra se construye una vez por árbol, junto con aristas_vert, y
+    se entrega como 'indice_vert' para dirigir_vertices y el canvas.
+    """
+    return frozenset(arista_normalizada(u, v) for u, v in aristas)
+
+
+def marcar_vertices_en_ciclo(funcion):
+    """
+    Marca los vértices que están en un ciclo de una función parcial.
+    
+    funcion[v] es la imagen de v (un índice en range(n)) o None si v no
+    tiene imagen. Recorre cada vértice una sola vez siguiendo punteros, en
+    O(n) y sin recursión. Retorna un bytearray con 1 en los vértices cíclicos.
+    """
+    n = len(funcion)
+    recorrido_de = [0] * n  # 0: sin visitar; k: visitado en el recorrido k
+    en_ciclo = bytearray(n)
+    
+    for inicio in range(n):
+        if recorrido_de[inicio]:
+            continue
+        
+        recorrido = inicio + 1
+        v = inicio
+        while v is not None and not recorrido_de[v]:
+            recorrido_de[v] = recorrido
+            v = funcion[v]
+        
+        # Si el recorrido se cerró sobre sí mismo, v está en un ciclo nuevo
+        if v is not None and recorrido_de[v] == recorrido:
+            w = v
+            while True:
+                en_ciclo[w] = 1
+                w = funcion[w]
+                if w == v:
+                    break
+    
+    return en_ciclo
+
+
+def arbol_desde_funcion(funcion):
+    """
+    Construye el árbol con vértebra asociado a una función (biyección de Joyal).
+    
+    Calcula los vértices cíclicos con marcar_vertices_en_ciclo y usa esas
+    marcas como tabla de pertenencia, de modo que todo el proceso es O(n).
+    Retorna el mismo diccionario que GraphLogic.construir_arbol_desde_funcion.
+    """
+    n = len(funcion)
+    en_ciclo = marcar_vertices_en_ciclo(funcion)
+    
+    # Recorrer las marcas en orden de índice ya deja los vértices ordenados
+    camino_orden = list(compress(range(n), en_ciclo))
+    camino_inv = [funcion[v] for v in camino_orden]
+    camino_vertebra = camino_inv[::-1]
+    aristas_vert = list(zip(camino_vertebra, camino_vertebra[1:]))
+    aristas_dir = [(i, funcion[i]) for i in range(n) if not en_ciclo[i]]
+    
+    return {
+        'camino_vertebra': camino_vertebra,
+        'camino_orden': camino_orden,
+        'camino_inv': camino_inv,
+        'aristas_vert': aristas_vert,
+        'indice_vert': indice_aristas(aristas_vert),
+        'aristas_dir': aristas_dir
+    }
 
 
 class GraphLogic:
@@ -17,70 +97,162 @@ class GraphLogic:
             n: Número de vértices (default 9)
         """
         self.n = n
-        self.parent = list(range(n))
-        self.grafo = [[] for _ in range(n)]
-        self.aristas = []
+        self.reset()
         
     def reset(self):
         """Reinicia el estado del grafo."""
-        self.parent = list(range(self.n))
+        # Union-Find sobre arreglos compactos: padre y tamaño de cada componente
+        self.parent = array('i', range(self.n))
+        self.size = array('i', [1]) * self.n
+        self.componentes = self.n
         self.grafo = [[] for _ in range(self.n)]
         self.aristas = []
     
     def find(self, x):
-        """Encuentra la raíz del conjunto disjunto."""
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        """Encuentra la raíz del conjunto disjunto (compresión de caminos iterativa)."""
+        parent = self.parent
+        raiz = x
+        while parent[raiz] != raiz:
+            raiz = parent[raiz]
+        
+        while parent[x] != raiz:
+            parent[x], x = raiz, parent[x]
+        return raiz
     
     def union(self, a, b):
-        """Une dos conjuntos disjuntos."""
+        """Une dos conjuntos disjuntos (unión por tamaño)."""
         rootA = self.find(a)
         rootB = self.find(b)
-        if rootA != rootB:
-            self.parent[rootB] = rootA
-            return True
-        return False
+        if rootA == rootB:
+            return False
+        
+        if self.size[rootA] < self.size[rootB]:
+            rootA, rootB = rootB, rootA
+        self.parent[rootB] = rootA
+        self.size[rootA] += self.size[rootB]
+        self.componentes -= 1
+        return True
+    
+    @property
+    def components(self):
+        """Número de componentes conexas; se mantiene al agregar aristas."""
+        return self.componentes
+    
+    @property
+    def is_connected(self):
+        """Indica en O(1) si el grafo es conexo."""
+        return self.componentes <= 1
     
     def grafoconexo(self):
-        """Verifica si el grafo es conexo."""
-        root0 = self.find(0)
-        return all(self.find(i) == root0 for i in range(self.n))
+        """Verifica si el grafo es conexo (en O(1), con el contador de componentes)."""
+        return self.is_connected
     
     def agregar_arista(self, v1, v2):
         """Agrega una arista al grafo si no forma ciclo."""
-        if self.find(v1) == self.find(v2):
+        if not self.union(v1, v2):
             return False  # Formaría un ciclo
         
         self.aristas.append((v1, v2))
-        self.union(v1, v2)
         self.grafo[v1].append(v2)
         self.grafo[v2].append(v1)
         return True
     
+    def agregar_aristas(self, aristas):
+        """
+        Agrega varias aristas en orden, omitiendo las que formarían ciclo.
+        Retorna el número de aristas agregadas.
+        """
+        return sum(1 for v1, v2 in aristas if self.agregar_arista(v1, v2))
+    
+    def generar_arbol_aleatorio(self, rng=None):
+        """
+        Reemplaza el grafo por un árbol etiquetado aleatorio uniforme.
+        
+        Decodifica una secuencia de Prüfer aleatoria en O(n), así que sirve
+        para n de millones. rng es un random.Random opcional.
+        Retorna la lista de aristas del árbol.
+        """
+        self.reset()
+        self.agregar_aristas(arbol_aleatorio(self.n, rng))
+        return self.aristas
+    
     def depthfirstsearch(self, vertice_ini, vertice_fin, path=None, visited=None):
-        """Búsqueda en profundidad para encontrar un camino."""
-        if path is None:
-            path = []
-        if visited is None:
-            visited = set()
+        """
+        Búsqueda en profundidad para encontrar un camino.
         
-        path = path + [vertice_ini]
-        visited.add(vertice_ini)
+        Es iterativa: una pila de iteradores de vecinos reproduce el orden de
+        la versión recursiva y el camino se reconstruye con punteros al padre,
+        así que no hay límite de recursión y la memoria usada es O(n).
+        path es un prefijo opcional del camino retornado y los vértices
+        visitados se agregan a visited si se pasa.
+        """
+        n = len(self.grafo)
+        visitado = bytearray(n)
+        if visited:
+            for v in visited:
+                visitado[v] = 1
+        padre = [-1] * n
         
-        if vertice_ini == vertice_fin:
-            return path
+        visitado[vertice_ini] = 1
+        encontrado = vertice_ini == vertice_fin
+        pila = [(vertice_ini, iter(self.grafo[vertice_ini]))]
         
-        for neighbor in self.grafo[vertice_ini]:
-            if neighbor not in visited:
-                newpath = self.depthfirstsearch(neighbor, vertice_fin, path, visited)
-                if newpath:
-                    return newpath
+        while pila and not encontrado:
+            vertice, vecinos = pila[-1]
+            for neighbor in vecinos:
+                if not visitado[neighbor]:
+                    visitado[neighbor] = 1
+                    padre[neighbor] = vertice
+                    if neighbor == vertice_fin:
+                        encontrado = True
+                    else:
+                        pila.append((neighbor, iter(self.grafo[neighbor])))
+                    break
+            else:
+                pila.pop()
         
-        return None
+        if visited is not None:
+            visited.update(v for v in range(n) if visitado[v])
+        
+        if not encontrado:
+            return None
+        
+        camino = [vertice_fin]
+        while camino[-1] != vertice_ini:
+            camino.append(padre[camino[-1]])
+        camino.reverse()
+        
+        return (list(path) + camino) if path else camino
     
     def vertices_en_ciclo(self, aristas_func):
-        """Encuentra los vértices que forman ciclos en una función."""
+        """
+        Encuentra los vértices que forman ciclos en una función.
+        
+        Si cada vértice tiene a lo sumo una arista de salida (grafo funcional)
+        se usa marcar_vertices_en_ciclo, en O(n); en otro caso se recurre a la
+        búsqueda por DFS sobre cada arista.
+        """
+        indice = {}
+        etiquetas = []
+        sucesor = []
+        
+        for u, v in aristas_func:
+            for x in (u, v):
+                if x not in indice:
+                    indice[x] = len(etiquetas)
+                    etiquetas.append(x)
+                    sucesor.append(None)
+            
+            iu = indice[u]
+            if sucesor[iu] is not None:
+                return self._vertices_en_ciclo_dfs(aristas_func)
+            sucesor[iu] = indice[v]
+        
+        en_ciclo = marcar_vertices_en_ciclo(sucesor)
+        return sorted(etiquetas[i] for i in range(len(etiquetas)) if en_ciclo[i])
+    
+    def _vertices_en_ciclo_dfs(self, aristas_func):
+        """Versión por DFS de vertices_en_ciclo para grafos que no son funcionales."""
         grafo = {}
         for u, v in aristas_func:
             grafo.setdefault(u, []).append(v)
@@ -122,8 +294,11 @@ class GraphLogic:
         
         return None
     
-    def dirigir_vertices(self, aristas, aristas_vert, vertice_fin):
-        """Dirige las aristas hacia el vértice final."""
+    def dirigir_vertices(self, aristas, aristas_vert, vertice_fin, indice_vert=None):
+        """
+        Dirige las aristas hacia el vértice final.
+        indice_vert es indice_aristas(aristas_vert), si ya está construido.
+        """
         distancia_a_fin = [-1] * len(self.grafo)
         queue = deque([vertice_fin])
         distancia_a_fin[vertice_fin] = 0
@@ -135,15 +310,11 @@ class GraphLogic:
                     distancia_a_fin[ady] = distancia_a_fin[vertice] + 1
                     queue.append(ady)
         
+        if indice_vert is None:
+            indice_vert = indice_aristas(aristas_vert)
         aristas_dir = []
         for v1, v2 in aristas:
-            en_vert = False
-            for a, b in aristas_vert:
-                if (v1 == a and v2 == b) or (v1 == b and v2 == a):
-                    en_vert = True
-                    break
-            
-            if not en_vert:
+            if arista_normalizada(v1, v2) not in indice_vert:
                 disv1 = distancia_a_fin[v1]
                 disv2 = distancia_a_fin[v2]
                 
@@ -160,20 +331,25 @@ class GraphLogic:
         
         if vertice_ini == vertice_fin:
             aristas_vert = []
+            indice_vert = frozenset()
             funcion[vertice_ini] = vertice_fin
             camino_vertebra = camino_inv = camino_orden = [vertice_fin]
-            aristas_dir = []
+            # El resto de vértices se dirige igualmente hacia el vértice final
+            aristas_dir = self.dirigir_vertices(self.aristas, aristas_vert, vertice_fin, indice_vert)
+            for a, b in aristas_dir:
+                funcion[a] = b
         else:
             camino_vertebra = self.depthfirstsearch(vertice_ini, vertice_fin)
             aristas_vert = [(camino_vertebra[i], camino_vertebra[i + 1]) 
                            for i in range(len(camino_vertebra) - 1)]
+            indice_vert = indice_aristas(aristas_vert)
             camino_orden = sorted(camino_vertebra)
             camino_inv = list(reversed(camino_vertebra))
             
             for i in range(len(camino_orden)):
                 funcion[camino_orden[i]] = camino_inv[i]
             
-            aristas_dir = self.dirigir_vertices(self.aristas, aristas_vert, vertice_fin)
+            aristas_dir = self.dirigir_vertices(self.aristas, aristas_vert, vertice_fin, indice_vert)
             for a, b in aristas_dir:
                 funcion[a] = b
         
@@ -183,37 +359,10 @@ class GraphLogic:
             'camino_orden': camino_orden,
             'camino_inv': camino_inv,
             'aristas_vert': aristas_vert,
+            'indice_vert': indice_vert,
             'aristas_dir': aristas_dir
         }
     
     def construir_arbol_desde_funcion(self, funcion):
-        """Construye un árbol a partir de una función."""
-        aristas_func = list(enumerate(funcion))
-        camino_orden = self.vertices_en_ciclo(aristas_func)
-        
-        camino_inv = []
-        for i in range(len(camino_orden)):
-            camino_inv.append(funcion[camino_orden[i]])
-        
-        camino_vertebra = list(reversed(camino_inv))
-        aristas_vert = [(camino_vertebra[i], camino_vertebra[i + 1]) 
-                       for i in range(len(camino_vertebra) - 1)]
-        
-        aristas_dir = []
-        for i in range(self.n):
-            en_vert = False
-            for f in range(len(camino_orden)):
-                if i == camino_orden[f]:
-                    en_vert = True
-                    break
-            
-            if not en_vert:
-                aristas_dir.append((i, funcion[i]))
-        
-        return {
-            'camino_vertebra': camino_vertebra,
-            'camino_orden': camino_orden,
-            'camino_inv': camino_inv,
-            'aristas_vert': aristas_vert,
-            'aristas_dir': aristas_dir
-        }
+        """Construye un árbol a partir de una función (ver arbol_desde_funcion)."""
+        return arbol_desde_funcion(funcion)
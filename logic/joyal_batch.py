@@ -0,0 +1,176 @@
+"""
+Módulo de la biyección de Joyal por lotes.
+Convierte muchas funciones en árboles con vértebra (y viceversa) usando
+arreglos de NumPy, sin el estado de GraphLogic.
+
+Representación de un árbol con vértebra de n vértices:
+    padres[v]: siguiente vértice de v en el camino hacia el vértice final
+               (-1 en el vértice final, que es la raíz)
+    inicio:    vértice inicial de la vértebra
+La vértebra es el camino inicio → ... → raíz y el resto de aristas apunta hacia ella.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def _como_lote(arr, nombre):
+    """Convierte arr en un arreglo 2-D de enteros (una fila por elemento)."""
+    arr = np.asarray(arr, dtype=np.int64)
+    if arr.ndim == 1:
+        arr = arr[np.newaxis, :]
+    if arr.ndim != 2:
+        raise ValueError("{} must be a 2-D array".format(nombre))
+    return arr
+
+
+def marcar_ciclos_lote(funciones):
+    """
+    Marca los vértices cíclicos de cada función de un lote (k × n).
+    
+    Un vértice es cíclico si está en la imagen de f^m con m >= n; f^(2^s)
+    se obtiene con s composiciones por cuadrados, cada una vectorizada sobre
+    todo el lote. Retorna una máscara booleana (k × n).
+    """
+    f = _como_lote(funciones, "Functions")
+    k, n = f.shape
+    if n and (f.min() < 0 or f.max() >= n):
+        raise ValueError("Function values must be in [0, n)")
+    
+    g = f
+    for _ in range(max(n - 1, 0).bit_length()):
+        g = np.take_along_axis(g, g, axis=1)
+    
+    en_ciclo = np.zeros((k, n), dtype=bool)
+    en_ciclo[np.arange(k)[:, np.newaxis], g] = True
+    return en_ciclo
+
+
+def arboles_desde_funciones(funciones):
+    """
+    Aplica la biyección de Joyal (función → árbol con vértebra) a un lote (k × n).
+    
+    Equivale a arbol_desde_funcion fila por fila. Retorna (padres, inicios):
+    padres es (k × n) con -1 en la raíz e inicios es (k,).
+    """
+    f = _como_lote(funciones, "Functions")
+    k, n = f.shape
+    en_ciclo = marcar_ciclos_lote(f)
+    
+    # Para cada vértice cíclico c_j, el cíclico anterior c_{j-1} (o -1)
+    idx = np.where(en_ciclo, np.arange(n), -1)
+    ultimo_hasta = np.maximum.accumulate(idx, axis=1)
+    anterior = np.full((k, n), -1, dtype=np.int64)
+    anterior[:, 1:] = ultimo_hasta[:, :-1]
+    
+    # La vértebra es f(c_{m-1}) → ... → f(c_0): f(c_j) apunta a f(c_{j-1})
+    padres = f.copy()
+    destino = np.where(anterior >= 0, np.take_along_axis(f, np.maximum(anterior, 0), axis=1), -1)
+    r, c = np.nonzero(en_ciclo)
+    padres[r, f[r, c]] = destino[r, c]
+    
+    inicios = f[np.arange(k), ultimo_hasta[:, -1]]
+    return padres, inicios
+
+
+def validar_arboles(padres, inicios):
+    """
+    Verifica que cada fila de padres describa un árbol con raíz y un vértice inicial válido.
+    
+    Cada fila debe tener exactamente una raíz (-1) y todo vértice debe llegar
+    a ella siguiendo padres; se comprueba con saltos de punteros por cuadrados.
+    Retorna una máscara booleana (k,).
+    """
+    padres = _como_lote(padres, "Parents")
+    k, n = padres.shape
+    inicios = np.asarray(inicios, dtype=np.int64).reshape(k)
+    
+    es_raiz = padres == -1
+    validos = (es_raiz.sum(axis=1) == 1) & (inicios >= 0) & (inicios < n)
+    validos &= ((padres >= -1) & (padres < n)).all(axis=1)
+    
+    raices = np.argmax(es_raiz, axis=1)
+    g = np.where(padres < 0, np.arange(n), np.clip(padres, 0, n - 1))
+    for _ in range(max(n - 1, 0).bit_length()):
+        g = np.take_along_axis(g, g, axis=1)
+    
+    return validos & (g == raices[:, np.newaxis]).all(axis=1)
+
+
+def funciones_desde_arboles(padres, inicios):
+    """
+    Aplica la biyección inversa (árbol con vértebra → función) a un lote.
+    
+    padres es (k × n) con -1 en la raíz de cada árbol e inicios es (k,).
+    Retorna las funciones como un arreglo (k × n).
+    """
+    padres = _como_lote(padres, "Parents")
+    k, n = padres.shape
+    inicios = np.asarray(inicios, dtype=np.int64).reshape(k)
+    todas = np.arange(k)
+    
+    # Recorrer la vértebra de todas las filas a la vez, un paso por iteración
+    vertebra = np.zeros((k, n), dtype=np.int64)
+    en_vertebra = np.zeros((k, n), dtype=bool)
+    largo = np.zeros(k, dtype=np.int64)
+    actual = inicios.copy()
+    activas = todas
+    
+    for paso in range(n):
+        vertebra[activas, paso] = actual[activas]
+        en_vertebra[activas, actual[activas]] = True
+        largo[activas] += 1
+        actual[activas] = padres[activas, actual[activas]]
+        activas = activas[actual[activas] >= 0]
+        if activas.size == 0:
+            break
+    else:
+        raise ValueError("Parent arrays must describe rooted trees")
+    
+    # f(camino_orden[i]) = camino_inv[i], con camino_inv la vértebra invertida
+    rango = np.cumsum(en_vertebra, axis=1) - 1
+    pos = np.clip(largo[:, np.newaxis] - 1 - rango, 0, n - 1)
+    imagen_vertebra = np.take_along_axis(vertebra, pos, axis=1)
+    
+    return np.where(en_vertebra, imagen_vertebra, padres)
+
+
+def padres_desde_aristas(aristas, raices):
+    """
+    Orienta un lote de árboles dados por aristas hacia sus raíces.
+    
+    aristas es (k × (n-1) × 2) y raices es (k,). Retorna padres (k × n) con
+    -1 en la raíz, listo para funciones_desde_arboles. Cada árbol se recorre
+    por anchura en O(n).
+    """
+    aristas = np.asarray(aristas, dtype=np.int64)
+    if aristas.ndim == 2:
+        aristas = aristas[np.newaxis]
+    k = aristas.shape[0]
+    n = aristas.shape[1] + 1
+    raices = np.asarray(raices, dtype=np.int64).reshape(k)
+    padres = np.full((k, n), -1, dtype=np.int64)
+    
+    for t in range(k):
+        ady = [[] for _ in range(n)]
+        for u, v in aristas[t].tolist():
+            ady[u].append(v)
+            ady[v].append(u)
+        
+        raiz = int(raices[t])
+        fila = [-2] * n
+        fila[raiz] = -1
+        cola = deque([raiz])
+        while cola:
+            u = cola.popleft()
+            for v in ady[u]:
+                if fila[v] == -2:
+                    fila[v] = u
+                    cola.append(v)
+        
+        if -2 in fila:
+            raise ValueError("Edges must describe a tree")
+        padres[t] = fila
+    
+    return padres
@@ -0,0 +1,162 @@
+"""
+Estadísticas del espacio de claves de get_matrix_from_function.
+
+Para un n dado enumera las n^n funciones (o toma una muestra uniforme),
+calcula sus claves por lotes y reporta:
+    - la tasa de respaldo: funciones cuya matriz generada no es invertible
+      módulo MOD y reciben la matriz diagonal de respaldo,
+    - las colisiones: funciones distintas que producen la misma clave,
+    - el tiempo y la tasa de claves por segundo.
+El trabajo se reparte por rangos entre varios procesos.
+
+Uso:
+    python -m logic.keyspace n [--muestras K] [--semilla S] [--procesos P] [--shard S] [--mod M]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from logic.math_utils import claves_como_bytes, matrices_desde_funciones
+from logic.parallel import ejecutar_rangos, linea_progreso
+from logic.ranking import funciones_desde_indices
+from logic.sampler import funciones_aleatorias
+
+
+def _contar_claves(claves, MOD=30):
+    """Cuenta las claves distintas de un lote (k × n × n) como {bytes: cantidad}."""
+    unicas, cantidades = np.unique(claves_como_bytes(claves, MOD), return_counts=True)
+    return {fila.tobytes(): int(c) for fila, c in zip(unicas, cantidades)}
+
+
+def analizar_funciones(funciones, MOD=30):
+    """
+    Analiza un lote de funciones (k × n).
+    Retorna un diccionario con el total, cuántas usaron respaldo y el conteo de claves.
+    """
+    claves, directas = matrices_desde_funciones(funciones, MOD)
+    return {
+        'total': len(claves),
+        'respaldo': int((~directas).sum()),
+        'claves': _contar_claves(claves, MOD),
+    }
+
+
+def analizar_rango(n, inicio, fin, MOD=30, semilla=None, lote=1 << 15):
+    """
+    Analiza las funciones con índice en [inicio, fin).
+    
+    Con semilla, en vez de enumerar se analizan fin - inicio funciones
+    aleatorias generadas con esa semilla.
+    """
+    total = respaldo = 0
+    claves = Counter()
+    gen = np.random.default_rng(semilla) if semilla is not None else None
+    
+    for a in range(inicio, fin, lote):
+        b = min(a + lote, fin)
+        if gen is None:
+            funciones = funciones_desde_indices(np.arange(a, b, dtype=np.int64), n)
+        else:
+            funciones = funciones_aleatorias(b - a, n, gen)
+        
+        r = analizar_funciones(funciones, MOD)
+        total += r['total']
+        respaldo += r['respaldo']
+        claves.update(r['claves'])
+    
+    return {'total': total, 'respaldo': respaldo, 'claves': claves}
+
+
+def analizar(n, muestras=None, semilla=None, procesos=None, shard=1 << 16, MOD=30, progreso=None):
+    """
+    Calcula las estadísticas del espacio de claves para funciones de tamaño n.
+    
+    Args:
+        n: Tamaño de las funciones
+        muestras: Número de funciones aleatorias (default: enumerar las n^n)
+        semilla: Semilla del muestreo; cada rango usa (semilla, rango)
+        procesos: Procesos entre los que se reparten los rangos
+        shard: Tamaño de cada rango
+        MOD: Módulo de las claves (default 30)
+        progreso: Destino de las líneas de progreso (por ejemplo print)
+    """
+    exhaustivo = muestras is None
+    total = n ** n if exhaustivo else muestras
+    num_shards = -(-total // shard)
+    if not exhaustivo and semilla is None:
+        semilla = np.random.SeedSequence().entropy
+    
+    inicio_t = time.perf_counter()
+    analizadas = respaldo = 0
+    claves = Counter()
+    hechos = 0
+    
+    def registrar(s, resultado):
+        nonlocal analizadas, respaldo, hechos
+        analizadas += resultado['total']
+        respaldo += resultado['respaldo']
+        claves.update(resultado['claves'])
+        hechos += 1
+        if progreso:
+            transcurrido = time.perf_counter() - inicio_t
+            progreso(linea_progreso(hechos, num_shards, "{:,} claves/s".format(
+                int(analizadas / transcurrido) if transcurrido > 0 else 0)))
+    
+    # Cada rango muestreado usa su propia semilla (semilla, rango)
+    rangos = ((s, (n, s * shard, min((s + 1) * shard, total), MOD, None if exhaustivo else [semilla, s]))
+              for s in range(num_shards))
+    ejecutar_rangos(analizar_rango, rangos, procesos, registrar)
+    
+    segundos = time.perf_counter() - inicio_t
+    repetidas = [c for c in claves.values() if c > 1]
+    return {
+        'n': n,
+        'exhaustivo': exhaustivo,
+        'semilla': semilla,
+        'total': analizadas,
+        'respaldo': respaldo,
+        'tasa_respaldo': respaldo / analizadas if analizadas else 0.0,
+        'claves_distintas': len(claves),
+        'claves_en_colision': len(repetidas),
+        'funciones_en_colision': sum(repetidas),
+        'max_funciones_por_clave': max(claves.values(), default=0),
+        'segundos': segundos,
+        'claves_por_segundo': analizadas / segundos if segundos > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Estadísticas de las claves generadas a partir de funciones de tamaño n.")
+    parser.add_argument('n', type=int, help="tamaño de las funciones")
+    parser.add_argument('--muestras', type=int, default=None, help="funciones aleatorias a analizar (default: todas las n^n)")
+    parser.add_argument('--semilla', type=int, default=None, help="semilla del muestreo")
+    parser.add_argument('--procesos', type=int, default=None, help="procesos de trabajo (default: todos los núcleos)")
+    parser.add_argument('--shard', type=int, default=1 << 16, help="funciones por rango de trabajo")
+    parser.add_argument('--mod', type=int, default=30, help="módulo de las claves")
+    args = parser.parse_args(argv)
+    
+    n = args.n
+    cuantas = f"{n ** n:,} funciones" if args.muestras is None else f"{args.muestras:,} funciones aleatorias"
+    print(f"Analizando {cuantas} para n = {n} (mod {args.mod})\n")
+    r = analizar(n, args.muestras, args.semilla, args.procesos, args.shard, args.mod, progreso=print)
+    
+    print()
+    if not r['exhaustivo']:
+        print(f"  Semilla:                 {r['semilla']}")
+    print(f"  Funciones analizadas:    {r['total']:,}")
+    print(f"  Con matriz de respaldo:  {r['respaldo']:,} ({100.0 * r['tasa_respaldo']:.2f}%)")
+    print(f"  Claves distintas:        {r['claves_distintas']:,}")
+    print(f"  Claves en colisión:      {r['claves_en_colision']:,} "
+          f"(compartidas por {r['funciones_en_colision']:,} funciones)")
+    print(f"  Máx. funciones por clave: {r['max_funciones_por_clave']:,}")
+    print(f"  Tiempo:                  {r['segundos']:.2f} s ({r['claves_por_segundo']:,.0f} claves/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ Contiene funciones para operaciones matriciales, determinantes y aritmética mod
 """
 
 import math
+from functools import lru_cache
+
 import numpy as np
 
 
@@ -25,42 +27,178 @@ def modinv(a, m):
     return x % m
 
 
-def determinante_bareiss(mat):
+def determinante_bareiss_inplace(A, n=None, p=None):
     """
-    Calcula el determinante usando el algoritmo de Bareiss.
+    Calcula el determinante por Bareiss directamente sobre el buffer A.
+    
+    A es una lista de listas de enteros y se modifica; solo se usa su
+    submatriz n×n superior izquierda, de modo que un mismo buffer sirve para
+    muchos determinantes. En cada paso se pivota sobre la entrada no nula de
+    menor valor absoluto de la columna para contener el crecimiento de los
+    enteros. Si se da un primo p, el cálculo se hace en GF(p).
     """
-    n = len(mat)
+    if n is None:
+        n = len(A)
     if n == 0:
         return 1
     
-    A = [list(map(int, row)) for row in mat]
+    if p is not None:
+        for i in range(n):
+            row = A[i]
+            for j in range(n):
+                row[j] %= p
+    
     prev = 1
     sign = 1
     
     for k in range(n - 1):
-        if A[k][k] == 0:
-            swap_row = None
-            for r in range(k + 1, n):
-                if A[r][k] != 0:
-                    swap_row = r
+        pivot_row = None
+        pivot_abs = 0
+        for r in range(k, n):
+            v = abs(A[r][k])
+            if v != 0 and (pivot_row is None or v < pivot_abs):
+                pivot_row, pivot_abs = r, v
+                if v == 1:
                     break
-            if swap_row is None:
-                return 0
-            A[k], A[swap_row] = A[swap_row], A[k]
-            sign *= -1
+        if pivot_row is None:
+            return 0
+        if pivot_row != k:
+            A[k], A[pivot_row] = A[pivot_row], A[k]
+            sign = -sign
         
-        pivot = A[k][k]
-        for i in range(k + 1, n):
-            for j in range(k + 1, n):
-                A[i][j] = (A[i][j] * pivot - A[i][k] * A[k][j]) // prev
+        row_k = A[k]
+        pivot = row_k[k]
+        if p is None:
+            for i in range(k + 1, n):
+                row_i = A[i]
+                a_ik = row_i[k]
+                for j in range(k + 1, n):
+                    row_i[j] = (row_i[j] * pivot - a_ik * row_k[j]) // prev
+        else:
+            inv_prev = modinv(prev, p)
+            for i in range(k + 1, n):
+                row_i = A[i]
+                a_ik = row_i[k]
+                for j in range(k + 1, n):
+                    row_i[j] = (row_i[j] * pivot - a_ik * row_k[j]) * inv_prev % p
         prev = pivot
     
-    return sign * A[n - 1][n - 1]
+    det = sign * A[n - 1][n - 1]
+    return det % p if p is not None else det
+
+
+def determinante_bareiss(mat, p=None):
+    """
+    Calcula el determinante usando el algoritmo de Bareiss.
+    Si se da un primo p, retorna el determinante módulo p.
+    """
+    A = [list(map(int, row)) for row in mat]
+    return determinante_bareiss_inplace(A, len(A), p)
+
+
+def determinantes_menores(M, p=None):
+    """
+    Calcula los determinantes de todos los menores de M (fila i y columna j eliminadas).
+    
+    Copia M una sola vez y reutiliza un único buffer (n-1)×(n-1) para todos
+    los menores. Retorna una lista de listas D con D[i][j] = det(menor(i, j)),
+    módulo p si se da un primo p.
+    """
+    n = len(M)
+    src = [list(map(int, row)) for row in M]
+    buf = [[0] * (n - 1) for _ in range(n - 1)]
+    out = [[0] * n for _ in range(n)]
+    
+    for i in range(n):
+        filas = src[:i] + src[i + 1:]
+        for j in range(n):
+            for r in range(n - 1):
+                row = filas[r]
+                buf[r][:j] = row[:j]
+                buf[r][j:] = row[j + 1:]
+            out[i][j] = determinante_bareiss_inplace(buf, n - 1, p)
+    
+    return out
+
+
+def _primos_libres_de_cuadrados(m):
+    """
+    Factoriza m y retorna la lista de sus primos si m es libre de cuadrados.
+    Retorna None si algún primo aparece con exponente mayor que 1.
+    """
+    primos = []
+    p = 2
+    while p * p <= m:
+        if m % p == 0:
+            m //= p
+            if m % p == 0:
+                return None
+            primos.append(p)
+        p += 1
+    if m > 1:
+        primos.append(m)
+    return primos
 
 
 def det_mod(mat, MOD):
-    """Calcula el determinante módulo MOD."""
-    return determinante_bareiss(mat) % MOD
+    """
+    Calcula el determinante módulo MOD.
+    Si MOD es libre de cuadrados combina los determinantes en cada GF(p) por CRT.
+    """
+    primos = _primos_libres_de_cuadrados(MOD)
+    if primos is None:
+        return determinante_bareiss(mat) % MOD
+    
+    det = 0
+    for p in primos:
+        q = MOD // p
+        det += determinante_mod_p(mat, p) * q * modinv(q, p)
+    return det % MOD
+
+
+def _tipo_mod(m):
+    """
+    Tipo de NumPy para aritmética módulo m: int64 si (m-1)² cabe en él; si no,
+    object, que opera con enteros de Python y es exacto para cualquier m.
+    """
+    return np.int64 if (m - 1) * (m - 1) < 1 << 63 else object
+
+
+def _reducir_mod(M, m):
+    """Convierte M en un arreglo cuadrado con entradas reducidas módulo m (ver _tipo_mod)."""
+    n = len(M)
+    if any(len(row) != n for row in M):
+        raise ValueError("Matrix must be square")
+    return np.array([[int(v) % m for v in row] for row in M], dtype=_tipo_mod(m)).reshape(n, n)
+
+
+def determinante_mod_p(M, p):
+    """
+    Calcula el determinante de M módulo el primo p por eliminación gaussiana.
+    Es exacto y usa solo enteros menores que p²; si p² no cabe en int64
+    usa determinante_bareiss, que opera con enteros de Python.
+    """
+    if _tipo_mod(p) is object:
+        return determinante_bareiss(M, p)
+    A = _reducir_mod(M, p)
+    n = A.shape[0]
+    det = 1
+    
+    for k in range(n):
+        filas = np.nonzero(A[k:, k])[0]
+        if filas.size == 0:
+            return 0
+        r = k + filas[0]
+        if r != k:
+            A[[k, r]] = A[[r, k]]
+            det = -det
+        
+        pivot = int(A[k, k])
+        det = (det * pivot) % p
+        factores = (A[k + 1:, k] * modinv(pivot, p)) % p
+        A[k + 1:] = (A[k + 1:] - np.outer(factores, A[k])) % p
+    
+    return det % p
 
 
 def minor_matrix(M, row, col):
@@ -73,21 +211,49 @@ def adjugate_matrix(M, MOD=30):
     """Calcula la matriz adjunta."""
     n = len(M)
     adj = [[0] * n for _ in range(n)]
+    menores = determinantes_menores(M)
     
     for i in range(n):
         for j in range(n):
-            minor = minor_matrix(M, i, j)
-            det_minor = determinante_bareiss(minor)
-            cofactor = ((-1) ** (i + j)) * det_minor
+            cofactor = ((-1) ** (i + j)) * menores[i][j]
             adj[j][i] = cofactor % MOD
     
     return adj
 
 
-def inverse_matrix_mod(M, MOD=30):
+def inverse_matrix_mod_p(M, p):
     """
-    Calcula la matriz inversa módulo MOD.
-    Retorna None si la matriz no es invertible.
+    Calcula la inversa de M en GF(p) por eliminación de Gauss-Jordan.
+    Retorna un arreglo de NumPy, o None si la matriz es singular módulo p.
+    Si p² no cabe en int64 se opera con enteros de Python.
+    """
+    tipo = _tipo_mod(p)
+    A = np.array([[int(v) % p for v in row] for row in M], dtype=tipo)
+    n = A.shape[0]
+    aug = np.concatenate([A, np.eye(n, dtype=np.int64).astype(tipo)], axis=1)
+    
+    for k in range(n):
+        filas = np.nonzero(aug[k:, k])[0]
+        if filas.size == 0:
+            return None
+        r = k + filas[0]
+        if r != k:
+            aug[[k, r]] = aug[[r, k]]
+        
+        aug[k] = (aug[k] * modinv(int(aug[k, k]), p)) % p
+        factores = aug[:, k].copy()
+        factores[k] = 0
+        aug -= np.outer(factores, aug[k])
+        aug %= p
+    
+    return aug[:, n:]
+
+
+def inverse_matrix_mod_adjugate(M, MOD=30):
+    """
+    Calcula la matriz inversa módulo MOD mediante la matriz adjunta.
+    Es O(n⁵) con enteros grandes; se conserva como referencia y para
+    módulos que no son libres de cuadrados.
     """
     n = len(M)
     if any(len(row) != n for row in M):
@@ -107,6 +273,163 @@ def inverse_matrix_mod(M, MOD=30):
     return inv
 
 
+def inverse_matrix_mod(M, MOD=30):
+    """
+    Calcula la matriz inversa módulo MOD.
+    Retorna None si la matriz no es invertible.
+    
+    Si MOD es libre de cuadrados (como 30 = 2·3·5) invierte la matriz en
+    cada GF(p) con Gauss-Jordan y recombina con el Teorema Chino del Resto,
+    en O(n³) con enteros pequeños (o de Python si MOD² no cabe en int64).
+    En otro caso usa la matriz adjunta.
+    """
+    n = len(M)
+    if any(len(row) != n for row in M):
+        raise ValueError("Matrix must be square")
+    
+    primos = _primos_libres_de_cuadrados(MOD)
+    if primos is None:
+        return inverse_matrix_mod_adjugate(M, MOD)
+    
+    A = _reducir_mod(M, MOD)
+    inv = np.zeros((n, n), dtype=A.dtype)
+    
+    for p in primos:
+        inv_p = inverse_matrix_mod_p(A, p)
+        if inv_p is None:
+            return None
+        # Coeficiente CRT: ≡ 1 (mod p) y ≡ 0 (mod MOD/p)
+        q = MOD // p
+        inv = (inv + inv_p.astype(inv.dtype) * (q * modinv(q, p))) % MOD
+    
+    return inv.tolist()
+
+
+def resolver_sistema_mod_p(A, B, p):
+    """
+    Resuelve A·X ≡ B en GF(p) con A de (m × b), m >= b, y B de (m × r).
+    
+    Elimina por Gauss-Jordan sobre [A | B]. Retorna X (b × r) como arreglo
+    de NumPy, o None si A no tiene rango b o el sistema es inconsistente.
+    """
+    A = (np.asarray(A, dtype=np.int64) % p).astype(_tipo_mod(p))
+    B = (np.asarray(B, dtype=np.int64) % p).astype(A.dtype)
+    m, b = A.shape
+    aug = np.concatenate([A, B.reshape(m, -1)], axis=1)
+    
+    for k in range(b):
+        filas = np.nonzero(aug[k:, k])[0]
+        if filas.size == 0:
+            return None
+        r = k + filas[0]
+        if r != k:
+            aug[[k, r]] = aug[[r, k]]
+        
+        aug[k] = (aug[k] * modinv(int(aug[k, k]), p)) % p
+        factores = aug[:, k].copy()
+        factores[k] = 0
+        aug -= np.outer(factores, aug[k])
+        aug %= p
+    
+    # Las ecuaciones sobrantes deben quedar 0 = 0
+    if aug[b:, b:].any():
+        return None
+    return aug[:b, b:]
+
+
+def resolver_sistema_mod(A, B, MOD=30):
+    """
+    Resuelve A·X ≡ B (mod MOD) resolviendo en cada GF(p) y recombinando con el CRT.
+    Retorna X como lista de listas, o None si la solución no es única o no existe.
+    """
+    primos = _primos_libres_de_cuadrados(MOD)
+    if primos is None:
+        raise ValueError("Modulus must be square-free")
+    
+    X = 0
+    for p in primos:
+        X_p = resolver_sistema_mod_p(A, B, p)
+        if X_p is None:
+            return None
+        q = MOD // p
+        X = (X + X_p.astype(_tipo_mod(MOD)) * (q * modinv(q, p))) % MOD
+    
+    return X.tolist()
+
+
+# Hasta este primo los inversos módulo p se toman de una tabla cacheada
+_MAX_TABLA_INVERSOS = 1 << 16
+
+
+@lru_cache(maxsize=None)
+def _tabla_inversos(p):
+    """Inversos módulo p de 0..p-1 (0 para el 0), como arreglo de solo lectura."""
+    tabla = np.array([0] + [pow(a, -1, p) for a in range(1, p)], dtype=np.int64)
+    tabla.setflags(write=False)
+    return tabla
+
+
+def _inversos_mod(valores, p):
+    """
+    Inversos módulo p de un arreglo 1-D de valores (0 para el 0), del mismo tipo.
+    Con p grande no hay tabla: se invierten solo los valores distintos.
+    """
+    if p <= _MAX_TABLA_INVERSOS:
+        return _tabla_inversos(p)[valores].astype(valores.dtype)
+    distintos, posicion = np.unique(valores, return_inverse=True)
+    inversos = np.array([pow(int(v), -1, p) if v else 0 for v in distintos], dtype=valores.dtype)
+    return inversos[posicion.ravel()]
+
+
+def inversas_mod_lote(mats, MOD=30):
+    """
+    Versión por lotes de inverse_matrix_mod para un arreglo (k × n × n).
+    
+    Hace Gauss-Jordan en cada GF(p) sobre todo el lote a la vez y recombina
+    con el CRT. Retorna (inversas, invertibles): inversas es (k × n × n),
+    con ceros en las matrices que no son invertibles.
+    """
+    A = np.asarray(mats, dtype=np.int64)
+    k, n, _ = A.shape
+    primos = _primos_libres_de_cuadrados(MOD)
+    if primos is None:
+        inversas = [inverse_matrix_mod(m.tolist(), MOD) for m in A]
+        invertibles = np.array([inv is not None for inv in inversas], dtype=bool)
+        resultado = np.zeros((k, n, n), dtype=np.int64)
+        for t in np.flatnonzero(invertibles):
+            resultado[t] = inversas[t]
+        return resultado, invertibles
+    
+    filas = np.arange(k)
+    invertibles = np.ones(k, dtype=bool)
+    resultado = np.zeros((k, n, n), dtype=_tipo_mod(MOD))
+    for p in primos:
+        # Con p pequeño los productos caben en int16, que recorre menos memoria
+        tipo = np.int16 if p * p < 1 << 15 else _tipo_mod(p)
+        aug = np.concatenate([A % p, np.eye(n, dtype=np.int64)[np.newaxis].repeat(k, axis=0)], axis=2).astype(tipo)
+        for c in range(n):
+            no_nulos = aug[:, c:, c] != 0
+            invertibles &= no_nulos.any(axis=1)
+            piv = c + np.argmax(no_nulos, axis=1)
+            
+            # Las columnas a la izquierda de c ya no cambian
+            fila = aug[filas, piv, c:]
+            aug[filas, piv, c:] = aug[:, c, c:]
+            fila = fila * _inversos_mod(fila[:, 0], p)[:, np.newaxis] % p
+            aug[:, c, c:] = fila
+            
+            factores = aug[:, :, c].copy()
+            factores[:, c] = 0
+            aug[:, :, c:] -= factores[:, :, np.newaxis] * fila[:, np.newaxis, :]
+            aug[:, :, c:] %= p
+        
+        q = MOD // p
+        resultado = (resultado + aug[:, :, n:].astype(resultado.dtype) * (q * modinv(q, p))) % MOD
+    
+    resultado[~invertibles] = 0
+    return resultado, invertibles
+
+
 def mat_mul_vec_nxn(M, vec, MOD=30):
     """Multiplica una matriz n×n por un vector."""
     n = len(vec)
@@ -123,9 +446,145 @@ def mat_mul_vec_nxn(M, vec, MOD=30):
 
 
 def is_invertible_mod(mat, mod):
-    """Verifica si una matriz es invertible módulo mod."""
-    det = int(round(np.linalg.det(mat)))
-    return math.gcd(det, mod) == 1
+    """
+    Verifica si una matriz es invertible módulo mod.
+    
+    Para mod libre de cuadrados basta que la matriz sea no singular en cada
+    GF(p); el cálculo es exacto, a diferencia de np.linalg.det en flotante.
+    """
+    primos = _primos_libres_de_cuadrados(mod)
+    if primos is None:
+        return math.gcd(determinante_bareiss(mat), mod) == 1
+    return all(determinante_mod_p(mat, p) != 0 for p in primos)
+
+
+def son_invertibles_mod(mats, mod):
+    """
+    Versión por lotes de is_invertible_mod para un arreglo (k × n × n).
+    
+    Para mod libre de cuadrados hace una eliminación gaussiana en cada GF(p)
+    sobre todo el lote a la vez. Retorna una máscara booleana (k,).
+    """
+    A = np.asarray(mats, dtype=np.int64)
+    primos = _primos_libres_de_cuadrados(mod)
+    if primos is None:
+        return np.array([is_invertible_mod(m, mod) for m in A], dtype=bool)
+    
+    k, n, _ = A.shape
+    ok = np.ones(k, dtype=bool)
+    for p in primos:
+        vivas = np.flatnonzero(ok)
+        B = (A[vivas] % p).astype(_tipo_mod(p))
+        for c in range(n):
+            no_nulos = B[:, c:, c] != 0
+            con_pivote = no_nulos.any(axis=1)
+            
+            # Las matrices sin pivote ya son singulares: se sacan del lote
+            if not con_pivote.all():
+                ok[vivas[~con_pivote]] = False
+                vivas, B, no_nulos = vivas[con_pivote], B[con_pivote], no_nulos[con_pivote]
+                if not vivas.size:
+                    break
+            piv = c + np.argmax(no_nulos, axis=1)
+            filas = np.arange(len(vivas))
+            
+            # Solo importa la submatriz que queda a la derecha de la columna c
+            fila_c = B[filas, piv, c:]
+            B[filas, piv, c:] = B[:, c, c:]
+            B[:, c, c:] = fila_c
+            
+            factor = B[:, c + 1:, c] * _inversos_mod(fila_c[:, 0], p)[:, np.newaxis] % p
+            B[:, c + 1:, c + 1:] -= factor[:, :, np.newaxis] * fila_c[:, np.newaxis, 1:]
+            B[:, c + 1:, c + 1:] %= p
+    return ok
+
+
+def _valor_diagonal_respaldo(f, MOD=30):
+    """Entrada diagonal de la matriz de respaldo para el valor f de la función."""
+    v = 3 * (f + 1) + 1
+    v %= MOD
+    
+    if v % 2 == 0:
+        v = (v + 1) % MOD
+    if v % 3 == 0:
+        v = (v + 1) % MOD
+    if v % 5 == 0:
+        v = (v + 1) % MOD
+    
+    while math.gcd(v, MOD) != 1:
+        v = (v + 1) % MOD
+    
+    return v
+
+
+@lru_cache(maxsize=None)
+def _tabla_respaldo(MOD):
+    """Entradas diagonales de respaldo para cada valor de la función módulo MOD."""
+    return np.array([_valor_diagonal_respaldo(v, MOD) for v in range(MOD)], dtype=np.int64)
+
+
+def _diagonales_respaldo(valores, MOD=30):
+    """
+    Entradas diagonales de respaldo para un arreglo de valores ya reducidos módulo MOD.
+    Con MOD grande no hay tabla: se calculan solo los valores distintos.
+    """
+    if MOD <= _MAX_TABLA_INVERSOS:
+        return _tabla_respaldo(MOD)[valores]
+    distintos, posicion = np.unique(valores, return_inverse=True)
+    diagonales = np.array([_valor_diagonal_respaldo(int(v), MOD) for v in distintos], dtype=np.int64)
+    return diagonales[posicion].reshape(valores.shape)
+
+
+def _matriz_generada(func, MOD=30):
+    """
+    Matriz func[i]·(j+1) + func[j] + 1 (mod MOD) por broadcasting.
+    func es una función (n,) o un lote (k × n); retorna (n × n) o (k × n × n).
+    """
+    f = np.asarray(func, dtype=np.int64)
+    j = np.arange(1, f.shape[-1] + 1, dtype=np.int64)
+    return (f[..., :, np.newaxis] * j + f[..., np.newaxis, :] + 1) % MOD
+
+
+def matrices_desde_funciones(funciones, MOD=30, dim=None):
+    """
+    Versión por lotes de get_matrix_from_function para funciones (k × n).
+    
+    Son unas pocas operaciones de NumPy sobre todo el lote: la matriz
+    generada por broadcasting, la invertibilidad con son_invertibles_mod y
+    las diagonales de respaldo con una tabla. Retorna (claves, directas):
+    claves es (k × dim × dim) y directas marca las funciones cuya matriz
+    generada era invertible; el resto usa la matriz diagonal de respaldo.
+    """
+    f = np.asarray(funciones, dtype=np.int64)
+    if f.ndim == 1:
+        f = f[np.newaxis, :]
+    if dim is not None and dim != f.shape[1]:
+        f = f[:, np.arange(dim) % f.shape[1]]
+    n = f.shape[1]
+    
+    claves = _matriz_generada(f, MOD)
+    directas = son_invertibles_mod(claves, MOD)
+    
+    if not directas.all():
+        respaldo = ~directas
+        diagonal = np.zeros((respaldo.sum(), n, n), dtype=np.int64)
+        diagonal[:, np.arange(n), np.arange(n)] = _diagonales_respaldo(f[respaldo] % MOD, MOD)
+        claves[respaldo] = diagonal
+    
+    return claves, directas
+
+
+def claves_como_bytes(claves, MOD=30):
+    """
+    Retorna cada clave de un lote (k × n × n) como un solo valor de bytes (k,).
+    
+    El tipo entero se elige según MOD para que claves distintas nunca
+    compartan bytes; así agrupar claves es ordenar con memcmp.
+    """
+    claves = np.asarray(claves)
+    tipo = np.uint8 if MOD <= 1 << 8 else np.uint16 if MOD <= 1 << 16 else np.int64
+    filas = np.ascontiguousarray(claves.reshape(len(claves), -1), dtype=tipo)
+    return filas.view(np.dtype((np.void, filas.shape[1] * filas.itemsize))).ravel()
 
 
 def get_matrix_from_function(funcion, MOD=30, dim=None):
@@ -143,34 +602,9 @@ def get_matrix_from_function(funcion, MOD=30, dim=None):
     clean = [(0 if v is None else int(v)) for v in funcion]
     func = [clean[i % len(clean)] for i in range(dim)]
     
-    arr = []
-    for i in range(dim):
-        row = []
-        for j in range(dim):
-            row.append((func[i] * (j + 1) + (func[j] + 1)) % MOD)
-        arr.append(row)
-    
-    mat = np.array(arr, dtype=int)
+    mat = _matriz_generada(func, MOD)
     
     if is_invertible_mod(mat, MOD):
         return mat
     
-    I = np.eye(dim, dtype=int)
-    
-    for i in range(dim):
-        v = 3 * (func[i] + 1) + 1
-        v %= MOD
-        
-        if v % 2 == 0:
-            v = (v + 1) % MOD
-        if v % 3 == 0:
-            v = (v + 1) % MOD
-        if v % 5 == 0:
-            v = (v + 1) % MOD
-        
-        while math.gcd(v, MOD) != 1:
-            v = (v + 1) % MOD
-        
-        I[i][i] = v
-    
-    return I
+    return np.diag(_diagonales_respaldo(np.asarray(func, dtype=np.int64) % MOD, MOD))
@@ -0,0 +1,82 @@
+"""
+Reparto de trabajo por rangos entre procesos.
+
+Lo usan las herramientas que recorren espacios grandes de funciones por
+rangos de índices (verifier, keyspace, cryptanalysis): cada rango se
+procesa en un proceso de trabajo y su resultado se registra en el proceso
+principal apenas termina, con a lo sumo 2·procesos rangos en curso para no
+acumular tareas ni resultados en memoria. ejecutar_en_orden hace lo mismo
+pero entrega los resultados en el orden de las tareas (file_cipher).
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+def ejecutar_rangos(fn, rangos, procesos=None, registrar=None):
+    """
+    Ejecuta fn(*args) para cada par (clave, args) de rangos.
+    
+    Los resultados llegan en orden de finalización: registrar(clave, resultado)
+    se llama en el proceso principal tras cada rango.
+    
+    Args:
+        fn: Función de nivel de módulo (debe poder enviarse a otro proceso)
+        rangos: Iterable de pares (clave, args)
+        procesos: Procesos de trabajo (default: todos los núcleos; 1 no crea pool)
+        registrar: Función llamada con (clave, resultado)
+    """
+    procesos = procesos or os.cpu_count() or 1
+    registrar = registrar or (lambda clave, resultado: None)
+    
+    if procesos == 1:
+        for clave, args in rangos:
+            registrar(clave, fn(*args))
+        return
+    
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        cola = iter(rangos)
+        en_curso = {}
+        for clave, args in cola:
+            en_curso[pool.submit(fn, *args)] = clave
+            if len(en_curso) >= 2 * procesos:
+                break
+        
+        while en_curso:
+            listos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                registrar(en_curso.pop(futuro), futuro.result())
+                siguiente = next(cola, None)
+                if siguiente is not None:
+                    clave, args = siguiente
+                    en_curso[pool.submit(fn, *args)] = clave
+
+
+def ejecutar_en_orden(fn, argumentos, procesos=None):
+    """
+    Ejecuta fn(*args) para cada args de argumentos y entrega los resultados en orden.
+    
+    Es un generador: con varios procesos mantiene a lo sumo 2·procesos
+    tareas en curso y espera a la más antigua antes de enviar otra.
+    Los argumentos son los de ejecutar_rangos.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        for args in argumentos:
+            yield fn(*args)
+        return
+    
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        en_curso = deque()
+        for args in argumentos:
+            en_curso.append(pool.submit(fn, *args))
+            if len(en_curso) >= 2 * procesos:
+                yield en_curso.popleft().result()
+        while en_curso:
+            yield en_curso.popleft().result()
+
+
+def linea_progreso(hechos, total, detalle):
+    """Retorna la línea de progreso '[hechos/total] porcentaje  detalle'."""
+    return "[{:>{w}}/{}] {:6.2f}%  {}".format(hechos, total, 100.0 * hechos / total, detalle, w=len(str(total)))
@@ -0,0 +1,207 @@
+"""
+Módulo de secuencias de Prüfer.
+Cada árbol etiquetado con n vértices corresponde a una única secuencia de
+n-2 valores en {0..n-1}; decodificar una secuencia aleatoria uniforme da un
+árbol aleatorio uniforme entre los n^(n-2) árboles etiquetados.
+
+Los árboles se dan como listas de n-1 aristas (u, v) y los lotes como
+arreglos (k × (n-1) × 2); las secuencias por lotes son arreglos (k × (n-2)).
+"""
+
+import random
+
+import numpy as np
+
+
+def decodificar_prufer(secuencia, n=None):
+    """
+    Construye las aristas del árbol con la secuencia de Prüfer dada, en O(n).
+    
+    Usa un puntero que solo avanza hacia la siguiente hoja libre, así que no
+    necesita montículo. Retorna una lista de n-1 aristas (hoja, vecino).
+    """
+    if n is None:
+        n = len(secuencia) + 2
+    if n <= 1:
+        return []
+    if len(secuencia) != n - 2:
+        raise ValueError("Prufer sequence must have n-2 elements")
+    
+    grado = [1] * n
+    for v in secuencia:
+        grado[v] += 1
+    
+    ptr = grado.index(1)
+    hoja = ptr
+    aristas = []
+    for v in secuencia:
+        aristas.append((hoja, v))
+        grado[v] -= 1
+        if grado[v] == 1 and v < ptr:
+            hoja = v
+        else:
+            ptr += 1
+            while grado[ptr] != 1:
+                ptr += 1
+            hoja = ptr
+    
+    aristas.append((hoja, n - 1))
+    return aristas
+
+
+def codificar_prufer(aristas, n=None):
+    """
+    Calcula la secuencia de Prüfer de un árbol dado por sus aristas, en O(n).
+    
+    Guarda por vértice el XOR de sus vecinos: al quitar una hoja, ese valor
+    es justamente su único vecino restante, así que no hace falta enraizar
+    el árbol. Retorna una lista de n-2 enteros.
+    """
+    aristas = list(aristas)
+    if n is None:
+        n = len(aristas) + 1
+    if len(aristas) != max(n - 1, 0):
+        raise ValueError("A tree with n vertices must have n-1 edges")
+    if n <= 2:
+        return []
+    
+    grado = [0] * n
+    vecinos = [0] * n
+    for u, v in aristas:
+        grado[u] += 1
+        grado[v] += 1
+        vecinos[u] ^= v
+        vecinos[v] ^= u
+    
+    ptr = grado.index(1)
+    hoja = ptr
+    secuencia = []
+    for _ in range(n - 2):
+        v = vecinos[hoja]
+        secuencia.append(v)
+        vecinos[v] ^= hoja
+        grado[v] -= 1
+        if grado[v] == 1 and v < ptr:
+            hoja = v
+        else:
+            ptr += 1
+            while grado[ptr] != 1:
+                ptr += 1
+            hoja = ptr
+    
+    return secuencia
+
+
+def _avanzar_a_hoja(grado, ptr, filas):
+    """Mueve ptr de cada fila indicada hasta su siguiente vértice de grado 1."""
+    ptr[filas] += 1
+    while filas.size:
+        filas = filas[grado[filas, ptr[filas]] != 1]
+        ptr[filas] += 1
+
+
+def codificar_lote(aristas):
+    """
+    Versión por lotes de codificar_prufer.
+    
+    aristas es (k × (n-1) × 2). Cada paso quita una hoja de todos los árboles
+    a la vez, con el mismo puntero y los mismos XOR de vecinos que la versión
+    simple. Conviene con muchos árboles; para pocos árboles muy grandes es
+    más rápido codificar_prufer. Retorna un arreglo (k × (n-2)).
+    """
+    aristas = np.asarray(aristas, dtype=np.int64)
+    if aristas.ndim == 2:
+        aristas = aristas[np.newaxis]
+    k = aristas.shape[0]
+    n = aristas.shape[1] + 1
+    secuencias = np.zeros((k, max(n - 2, 0)), dtype=np.int64)
+    if n <= 2:
+        return secuencias
+    
+    filas = np.arange(k)
+    u, v = aristas[:, :, 0], aristas[:, :, 1]
+    if u.min() < 0 or v.min() < 0 or u.max() >= n or v.max() >= n:
+        raise ValueError("Edge endpoints must be in [0, n)")
+    r = np.repeat(filas, n - 1)
+    grado = np.zeros((k, n), dtype=np.int64)
+    np.add.at(grado, (r, u.ravel()), 1)
+    np.add.at(grado, (r, v.ravel()), 1)
+    vecinos = np.zeros((k, n), dtype=np.int64)
+    np.bitwise_xor.at(vecinos, (r, u.ravel()), v.ravel())
+    np.bitwise_xor.at(vecinos, (r, v.ravel()), u.ravel())
+    if not (grado >= 1).all():
+        raise ValueError("Edges must describe a tree")
+    
+    ptr = np.argmax(grado == 1, axis=1)
+    hoja = ptr.copy()
+    for i in range(n - 2):
+        w = vecinos[filas, hoja]
+        secuencias[:, i] = w
+        vecinos[filas, w] ^= hoja
+        grado[filas, w] -= 1
+        libre = (grado[filas, w] == 1) & (w < ptr)
+        _avanzar_a_hoja(grado, ptr, filas[~libre])
+        hoja = np.where(libre, w, ptr)
+    
+    return secuencias
+
+
+def decodificar_lote(secuencias, n=None):
+    """
+    Versión por lotes de decodificar_prufer.
+    
+    secuencias es (k × (n-2)). Retorna las aristas como un arreglo
+    (k × (n-1) × 2), en el mismo orden que decodificar_prufer.
+    """
+    secuencias = np.asarray(secuencias, dtype=np.int64)
+    if secuencias.ndim == 1:
+        secuencias = secuencias[np.newaxis]
+    k, m = secuencias.shape
+    if n is None:
+        n = m + 2
+    if m != max(n - 2, 0):
+        raise ValueError("Prufer sequence must have n-2 elements")
+    aristas = np.zeros((k, max(n - 1, 0), 2), dtype=np.int64)
+    if n <= 1:
+        return aristas
+    if m and (secuencias.min() < 0 or secuencias.max() >= n):
+        raise ValueError("Prufer sequence values must be in [0, n)")
+    
+    filas = np.arange(k)
+    grado = np.ones((k, n), dtype=np.int64)
+    np.add.at(grado, (np.repeat(filas, m), secuencias.ravel()), 1)
+    
+    ptr = np.argmax(grado == 1, axis=1)
+    hoja = ptr.copy()
+    for i in range(m):
+        w = secuencias[:, i]
+        aristas[:, i, 0] = hoja
+        aristas[:, i, 1] = w
+        grado[filas, w] -= 1
+        libre = (grado[filas, w] == 1) & (w < ptr)
+        _avanzar_a_hoja(grado, ptr, filas[~libre])
+        hoja = np.where(libre, w, ptr)
+    
+    aristas[:, -1, 0] = hoja
+    aristas[:, -1, 1] = n - 1
+    return aristas
+
+
+def secuencia_aleatoria(n, rng=None):
+    """Genera una secuencia de Prüfer uniforme para n vértices."""
+    rng = rng or random
+    return [rng.randrange(n) for _ in range(max(n - 2, 0))]
+
+
+def arbol_aleatorio(n, rng=None):
+    """Genera las aristas de un árbol etiquetado uniforme con n vértices."""
+    return decodificar_prufer(secuencia_aleatoria(n, rng), n)
+
+
+def arboles_aleatorios(k, n, seed=None):
+    """
+    Genera k árboles etiquetados uniformes con n vértices.
+    Retorna un arreglo (k × (n-1) × 2) con las aristas de cada árbol.
+    """
+    gen = np.random.default_rng(seed)
+    return decodificar_lote(gen.integers(0, n, size=(k, max(n - 2, 0))), n)
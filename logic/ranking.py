@@ -0,0 +1,97 @@
+"""
+Módulo de ranking de funciones y árboles con vértebra.
+
+Asigna a cada función f: {0..n-1} → {0..n-1} un índice entero en [0, n^n):
+la función leída como número en base n, con f(0) como dígito más significativo.
+Un árbol con vértebra recibe el índice de la función que le corresponde por la
+biyección de Joyal, así que funciones y árboles se pueden guardar, intercambiar
+y enumerar por rangos como enteros simples.
+"""
+
+import numpy as np
+
+from logic.graph_logic import arbol_desde_funcion
+from logic.joyal_batch import arboles_desde_funciones, funciones_desde_arboles, padres_desde_aristas
+
+
+def _cabe_en_int64(n):
+    """Indica si todos los índices de tamaño n caben en un entero de 64 bits."""
+    return n ** n <= np.iinfo(np.int64).max
+
+
+def rank_funcion(funcion):
+    """Retorna el índice en [0, n^n) de una función."""
+    n = len(funcion)
+    indice = 0
+    for v in funcion:
+        v = int(v)
+        if not 0 <= v < n:
+            raise ValueError("Function values must be in [0, n)")
+        indice = indice * n + v
+    return indice
+
+
+def unrank_funcion(indice, n):
+    """Retorna la función (lista) con el índice dado."""
+    if not 0 <= indice < n ** n:
+        raise ValueError("Index must be in [0, n^n)")
+    funcion = [0] * n
+    for i in range(n - 1, -1, -1):
+        indice, funcion[i] = divmod(indice, n)
+    return funcion
+
+
+def indices_desde_funciones(funciones):
+    """
+    Versión por lotes de rank_funcion para un arreglo (k × n).
+    Retorna un arreglo int64 si los índices caben; si no, uno de enteros de Python.
+    """
+    f = np.asarray(funciones, dtype=np.int64)
+    n = f.shape[1]
+    if not _cabe_en_int64(n):
+        return np.array([rank_funcion(fila) for fila in f.tolist()], dtype=object)
+    
+    indices = np.zeros(f.shape[0], dtype=np.int64)
+    for j in range(n):
+        indices = indices * n + f[:, j]
+    return indices
+
+
+def funciones_desde_indices(indices, n):
+    """Versión por lotes de unrank_funcion: convierte índices en funciones (k × n)."""
+    if not _cabe_en_int64(n):
+        return np.array([unrank_funcion(int(i), n) for i in indices], dtype=np.int64)
+    
+    indices = np.asarray(indices, dtype=np.int64)
+    potencias = n ** np.arange(n - 1, -1, -1, dtype=np.int64)
+    return (indices[:, np.newaxis] // potencias) % n
+
+
+def rank_arbol(aristas, vertice_ini, vertice_fin):
+    """
+    Retorna el índice de un árbol con vértebra dado por sus aristas (como GraphLogic.aristas).
+    Es el índice de la función que la biyección de Joyal asocia al árbol.
+    """
+    padres = padres_desde_aristas([list(aristas)] if aristas else np.zeros((1, 0, 2)), [vertice_fin])
+    funcion = funciones_desde_arboles(padres, [vertice_ini])[0]
+    return rank_funcion(funcion)
+
+
+def unrank_arbol(indice, n):
+    """
+    Retorna el árbol con vértebra de índice dado como (aristas, vertice_ini, vertice_fin).
+    Las aristas son las de la vértebra seguidas de las dirigidas hacia ella.
+    """
+    result = arbol_desde_funcion(unrank_funcion(indice, n))
+    vertebra = result['camino_vertebra']
+    return result['aristas_vert'] + result['aristas_dir'], vertebra[0], vertebra[-1]
+
+
+def arboles_desde_indices(indices, n):
+    """Versión por lotes de unrank_arbol: retorna (padres, inicios) como en logic.joyal_batch."""
+    return arboles_desde_funciones(funciones_desde_indices(indices, n))
+
+
+def indices_desde_arboles(padres, inicios):
+    """Versión por lotes de rank_arbol para árboles dados como (padres, inicios)."""
+    return indices_desde_funciones(funciones_desde_arboles(padres, inicios))
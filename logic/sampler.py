@@ -0,0 +1,121 @@
+"""
+Módulo de muestreo de funciones aleatorias.
+Genera lotes de funciones f: {0..n-1} → {0..n-1} como arreglos de NumPy
+(k × n), con semilla reproducible, para pruebas de carga y estadísticas.
+
+Además de funciones uniformes se pueden pedir permutaciones uniformes o
+funciones uniformes entre las que tienen exactamente c puntos cíclicos.
+"""
+
+from math import perm
+
+import numpy as np
+
+from logic.prufer import decodificar_lote
+
+
+def contar_funciones_con_ciclicos(n, c):
+    """
+    Retorna cuántas funciones de tamaño n tienen exactamente c puntos cíclicos.
+    
+    Son n!/(n-c)! formas de elegir los cíclicos y permutarlos por c·n^(n-c-1)
+    bosques con raíces en ellos (c·n^(-1) = 1 cuando c = n).
+    """
+    if not 1 <= c <= n:
+        return 0
+    if c == n:
+        return perm(n)
+    return perm(n, c) * c * n ** (n - c - 1)
+
+
+def _permutar_filas(gen, k, n):
+    """Retorna k permutaciones uniformes de range(n) como arreglo (k × n)."""
+    return gen.permuted(np.broadcast_to(np.arange(n, dtype=np.int64), (k, n)), axis=1)
+
+
+def funciones_aleatorias(k, n, seed=None):
+    """Genera k funciones uniformes de tamaño n como arreglo (k × n)."""
+    gen = np.random.default_rng(seed)
+    return gen.integers(0, n, size=(k, n), dtype=np.int64)
+
+
+def permutaciones_aleatorias(k, n, seed=None):
+    """Genera k permutaciones uniformes de tamaño n como arreglo (k × n)."""
+    return _permutar_filas(np.random.default_rng(seed), k, n)
+
+
+def funciones_con_ciclicos(k, n, c, seed=None):
+    """
+    Genera k funciones uniformes entre las que tienen exactamente c puntos cíclicos.
+    
+    Se elige el conjunto cíclico S y una permutación de S al azar; el resto
+    es un bosque con raíces en S. Contrayendo S en un solo vértice r (el de
+    mayor etiqueta) el bosque es un árbol sobre los m = n-c vértices
+    restantes más r, y cada arista hacia r elige una de las c raíces: una
+    secuencia de Prüfer con m-1 símbolos en {0..n-1}, donde los valores >= m
+    significan "r a través de la raíz valor-m", más una raíz uniforme para la
+    última arista, recorre cada bosque exactamente una vez.
+    Retorna un arreglo (k × n).
+    """
+    if not 1 <= c <= n:
+        raise ValueError("Number of cyclic points must be in [1, n]")
+    gen = np.random.default_rng(seed)
+    m = n - c
+    
+    orden = _permutar_filas(gen, k, n)
+    ciclicos, resto = orden[:, :c], orden[:, c:]
+    sigma = _permutar_filas(gen, k, c)
+    
+    filas = np.arange(k)[:, np.newaxis]
+    funciones = np.empty((k, n), dtype=np.int64)
+    funciones[filas, ciclicos] = np.take_along_axis(ciclicos, sigma, axis=1)
+    if m == 0:
+        return funciones
+    
+    # Las hojas del árbol contraído apuntan a su vecino de la secuencia
+    secuencias = gen.integers(0, n, size=(k, m - 1), dtype=np.int64)
+    aristas = decodificar_lote(np.minimum(secuencias, m), m + 1)
+    elecciones = np.concatenate([secuencias, gen.integers(m, n, size=(k, 1), dtype=np.int64)], axis=1)
+    
+    destinos = np.where(
+        elecciones < m,
+        np.take_along_axis(resto, np.minimum(elecciones, m - 1), axis=1),
+        np.take_along_axis(ciclicos, np.maximum(elecciones - m, 0), axis=1)
+    )
+    funciones[filas, np.take_along_axis(resto, aristas[:, :, 0], axis=1)] = destinos
+    return funciones
+
+
+class FunctionSampler:
+    """Muestreador con semilla que entrega lotes de funciones de tamaño n."""
+    
+    def __init__(self, n, seed=None):
+        """
+        Args:
+            n: Tamaño de las funciones
+            seed: Semilla (o np.random.Generator) para reproducir los lotes
+        """
+        self.n = n
+        self.gen = np.random.default_rng(seed)
+    
+    def lote(self, k, ciclicos=None, permutacion=False):
+        """
+        Retorna un lote (k × n) de funciones aleatorias.
+        
+        Con permutacion se generan permutaciones; con ciclicos, funciones
+        con exactamente ese número de puntos cíclicos.
+        """
+        if permutacion:
+            return permutaciones_aleatorias(k, self.n, self.gen)
+        if ciclicos is not None:
+            return funciones_con_ciclicos(k, self.n, ciclicos, self.gen)
+        return funciones_aleatorias(k, self.n, self.gen)
+    
+    def lotes(self, total, tam_lote=1 << 16, **opciones):
+        """Itera lotes de a lo sumo tam_lote funciones hasta completar total."""
+        for inicio in range(0, total, tam_lote):
+            yield self.lote(min(tam_lote, total - inicio), **opciones)
+    
+    def funcion(self, **opciones):
+        """Retorna una sola función aleatoria como lista."""
+        return self.lote(1, **opciones)[0].tolist()
@@ -0,0 +1,268 @@
+"""
+Verificador exhaustivo de la biyección de Joyal.
+
+Enumera las n^n funciones de {0..n-1} en sí mismo, repartidas por rangos de
+índices entre varios procesos, y comprueba para cada una que:
+    1. la función produce un árbol con vértebra válido, y
+    2. el árbol devuelve exactamente la función original.
+Con eso la correspondencia función → árbol es inyectiva. Para la otra
+dirección enumera también los árboles con vértebra sin pasar por la
+biyección (secuencia de Prüfer × vértice final × vértice inicial, que son
+n^(n-2)·n² por la fórmula de Cayley) y comprueba que cada árbol vuelve a sí
+mismo a través de su función. Si ambas idas y vueltas son exactas, la
+correspondencia es una biyección entre las n^n funciones y los n^(n-2)·n²
+árboles con vértebra.
+
+Uso:
+    python -m logic.verifier n [--procesos P] [--shard S] [--checkpoint archivo] [--exacto]
+
+Con --checkpoint el progreso se guarda tras cada rango y una ejecución
+interrumpida continúa desde donde quedó.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from logic.graph_logic import GraphLogic, arista_normalizada
+from logic.joyal_batch import arboles_desde_funciones, funciones_desde_arboles, validar_arboles
+from logic.parallel import ejecutar_rangos, linea_progreso
+from logic.prufer import decodificar_lote
+from logic.ranking import funciones_desde_indices
+
+
+# Número máximo de índices de funciones fallidas que se reportan por rango
+MAX_FALLOS = 10
+
+
+def _ida_y_vuelta_exacta(funcion):
+    """Hace la ida y vuelta de una función con GraphLogic; retorna True si es exacta."""
+    n = len(funcion)
+    result = GraphLogic(n).construir_arbol_desde_funcion(funcion)
+    
+    gl = GraphLogic(n)
+    for u, v in result['aristas_vert'] + result['aristas_dir']:
+        if not gl.agregar_arista(u, v):
+            return False
+    if len(gl.aristas) != n - 1 or not gl.grafoconexo():
+        return False
+    
+    vertebra = result['camino_vertebra']
+    return gl.construir_funcion_desde_arbol(vertebra[0], vertebra[-1])['funcion'] == funcion
+
+
+def _arbol_ida_y_vuelta_exacta(aristas, inicio, fin):
+    """Hace la ida y vuelta árbol → función → árbol con GraphLogic; retorna True si es exacta."""
+    n = len(aristas) + 1
+    gl = GraphLogic(n)
+    for u, v in aristas:
+        gl.agregar_arista(u, v)
+    funcion = gl.construir_funcion_desde_arbol(inicio, fin)['funcion']
+    
+    result = GraphLogic(n).construir_arbol_desde_funcion(funcion)
+    vertebra = result['camino_vertebra']
+    vuelta = {arista_normalizada(u, v) for u, v in result['aristas_vert'] + result['aristas_dir']}
+    return (vertebra[0], vertebra[-1]) == (inicio, fin) and vuelta == {arista_normalizada(u, v) for u, v in aristas}
+
+
+def _arboles_por_prufer(indices, n):
+    """
+    Enumera árboles con vértebra sin pasar por la biyección de Joyal.
+    
+    El índice t se lee como (secuencia de Prüfer t // n², vértice final
+    (t // n) % n, vértice inicial t % n). Retorna (aristas, finales, inicios)
+    con aristas (k × (n-1) × 2) como las de decodificar_lote.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    potencias = n ** np.arange(max(n - 2, 0) - 1, -1, -1, dtype=np.int64)
+    secuencias = (indices[:, np.newaxis] // (n * n) // potencias) % n
+    return decodificar_lote(secuencias, n), (indices // n) % n, indices % n
+
+
+def _padres_hacia(aristas, raices, n):
+    """
+    Orienta un lote de aristas de decodificar_lote hacia raices (k,).
+    
+    Cada arista (hoja, vecino) ya apunta hacia n-1, así que basta invertir el
+    camino de cada raíz hasta n-1, un paso por iteración sobre todo el lote.
+    """
+    k = len(raices)
+    filas = np.arange(k)
+    hacia_ultimo = np.full((k, n), -1, dtype=np.int64)
+    hacia_ultimo[filas[:, np.newaxis], aristas[:, :, 0]] = aristas[:, :, 1]
+    
+    padres = hacia_ultimo.copy()
+    actual = np.array(raices, dtype=np.int64)
+    anterior = np.full(k, -1, dtype=np.int64)
+    activas = filas
+    while activas.size:
+        v = actual[activas]
+        siguiente = hacia_ultimo[activas, v]
+        padres[activas, v] = anterior[activas]
+        anterior[activas] = v
+        actual[activas] = siguiente
+        activas = activas[siguiente >= 0]
+    return padres
+
+
+def verificar_rango(n, inicio, fin, exacto=False, lote=1 << 16):
+    """
+    Verifica las funciones con índice en [inicio, fin).
+    
+    También verifica los árboles con índice en [inicio, fin) según
+    _arboles_por_prufer. Por defecto usa la biyección por lotes de
+    logic.joyal_batch; con exacto usa los métodos de GraphLogic uno por uno
+    (mucho más lento). Retorna un diccionario con el número de funciones y
+    de árboles verificados y los índices de los primeros que fallaron.
+    """
+    verificadas = arboles = 0
+    fallos = []
+    fallos_arboles = []
+    
+    for a in range(inicio, fin, lote):
+        indices = np.arange(a, min(a + lote, fin), dtype=np.int64)
+        funciones = funciones_desde_indices(indices, n)
+        aristas, finales, inicios_t = _arboles_por_prufer(indices, n)
+        
+        if exacto:
+            ok = np.array([_ida_y_vuelta_exacta(f) for f in funciones.tolist()], dtype=bool)
+            ok_t = np.array([_arbol_ida_y_vuelta_exacta(ar, i, f)
+                             for ar, f, i in zip(aristas.tolist(), finales.tolist(), inicios_t.tolist())], dtype=bool)
+        else:
+            padres, inicios = arboles_desde_funciones(funciones)
+            ok = validar_arboles(padres, inicios)
+            ok &= (funciones_desde_arboles(padres, inicios) == funciones).all(axis=1)
+            
+            padres_t = _padres_hacia(aristas, finales, n)
+            vuelta, inicios_vuelta = arboles_desde_funciones(funciones_desde_arboles(padres_t, inicios_t))
+            ok_t = (vuelta == padres_t).all(axis=1) & (inicios_vuelta == inicios_t)
+        
+        verificadas += int(ok.sum())
+        arboles += int(ok_t.sum())
+        if len(fallos) < MAX_FALLOS:
+            fallos.extend(indices[~ok][:MAX_FALLOS - len(fallos)].tolist())
+        if len(fallos_arboles) < MAX_FALLOS:
+            fallos_arboles.extend(indices[~ok_t][:MAX_FALLOS - len(fallos_arboles)].tolist())
+    
+    return {'verificadas': verificadas, 'arboles': arboles, 'fallos': fallos, 'fallos_arboles': fallos_arboles}
+
+
+def _cargar_checkpoint(ruta, parametros):
+    """Lee el checkpoint si existe y coincide con los parámetros de la ejecución."""
+    if not ruta or not os.path.exists(ruta):
+        return {**parametros, 'completados': [], 'verificadas': 0, 'arboles': 0, 'fallos': [], 'fallos_arboles': []}
+    
+    with open(ruta, encoding='utf-8') as fh:
+        estado = json.load(fh)
+    for clave, valor in parametros.items():
+        if estado.get(clave) != valor:
+            raise ValueError("Checkpoint {} was created with {}={}, not {}".format(
+                ruta, clave, estado.get(clave), valor))
+    return estado
+
+
+def _guardar_checkpoint(ruta, estado):
+    """Escribe el checkpoint de forma atómica."""
+    if not ruta:
+        return
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as fh:
+        json.dump(estado, fh)
+    os.replace(temporal, ruta)
+
+
+def verificar(n, procesos=None, shard=1 << 22, checkpoint=None, exacto=False, progreso=None):
+    """
+    Verifica la biyección para todas las funciones de tamaño n.
+    
+    Args:
+        n: Número de vértices
+        procesos: Procesos de trabajo, como en logic.parallel.ejecutar_rangos
+        shard: Número de funciones por rango de trabajo
+        checkpoint: Ruta del archivo JSON para reanudar la verificación
+        exacto: Usar GraphLogic en vez de la biyección por lotes
+        progreso: Función llamada con un texto tras cada rango completado
+    """
+    total = n ** n
+    num_shards = -(-total // shard)
+    # Los checkpoints sin la verificación de árboles no se pueden reanudar
+    parametros = {'n': n, 'shard': shard, 'exacto': exacto, 'ambas_direcciones': True}
+    estado = _cargar_checkpoint(checkpoint, parametros)
+    completados = set(estado['completados'])
+    pendientes = [s for s in range(num_shards) if s not in completados]
+    
+    inicio_t = time.perf_counter()
+    hechas = 0
+    
+    def registrar(s, resultado):
+        nonlocal hechas
+        completados.add(s)
+        estado['completados'] = sorted(completados)
+        estado['verificadas'] += resultado['verificadas']
+        estado['arboles'] += resultado['arboles']
+        estado['fallos'] = (estado['fallos'] + resultado['fallos'])[:MAX_FALLOS]
+        estado['fallos_arboles'] = (estado['fallos_arboles'] + resultado['fallos_arboles'])[:MAX_FALLOS]
+        _guardar_checkpoint(checkpoint, estado)
+        
+        hechas += min(shard, total - s * shard)
+        if progreso:
+            transcurrido = time.perf_counter() - inicio_t
+            tasa = hechas / transcurrido if transcurrido > 0 else 0.0
+            restantes = total - min(len(completados) * shard, total)
+            eta = restantes / tasa if tasa else 0.0
+            progreso(linea_progreso(len(completados), num_shards,
+                                    "{:,} funciones/s  ETA {:.0f} s".format(int(tasa), eta)))
+    
+    rangos = ((s, (n, s * shard, min((s + 1) * shard, total), exacto)) for s in pendientes)
+    ejecutar_rangos(verificar_rango, rangos, procesos, registrar)
+    
+    completo = len(completados) == num_shards
+    return {
+        'n': n,
+        'total': total,
+        'verificadas': estado['verificadas'],
+        'arboles': estado['arboles'],
+        'fallos': estado['fallos'],
+        'fallos_arboles': estado['fallos_arboles'],
+        'completo': completo,
+        'biyeccion': completo and estado['verificadas'] == estado['arboles'] == total,
+    }
+
+
+def main(argv=None):
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Verifica la biyección de Joyal para todas las funciones y árboles con vértebra de tamaño n.")
+    parser.add_argument('n', type=int, help="número de vértices")
+    parser.add_argument('--procesos', type=int, default=None, help="procesos de trabajo (default: todos los núcleos)")
+    parser.add_argument('--shard', type=int, default=1 << 22, help="funciones por rango de trabajo")
+    parser.add_argument('--checkpoint', default=None, help="archivo JSON para guardar y reanudar el progreso")
+    parser.add_argument('--exacto', action='store_true', help="usar GraphLogic función por función y árbol por árbol")
+    args = parser.parse_args(argv)
+    
+    n = args.n
+    print(f"Verificando {n ** n:,} funciones y {n ** n:,} árboles con vértebra para n = {n}\n")
+    r = verificar(n, args.procesos, args.shard, args.checkpoint, args.exacto, progreso=print)
+    
+    print()
+    if not r['completo']:
+        print("Verificación incompleta.")
+        return 1
+    if not r['biyeccion']:
+        if r['verificadas'] < r['total']:
+            print(f"✗ {r['total'] - r['verificadas']:,} funciones fallaron. Primeros índices: {r['fallos']}")
+        if r['arboles'] < r['total']:
+            print(f"✗ {r['total'] - r['arboles']:,} árboles fallaron. Primeros índices: {r['fallos_arboles']}")
+        return 1
+    
+    print(f"✓ Las {r['verificadas']:,} funciones hacen ida y vuelta exacta (función → árbol → función).")
+    print(f"✓ Los {r['arboles']:,} árboles con vértebra hacen ida y vuelta exacta (árbol → función → árbol).")
+    print(f"  La correspondencia es una biyección: {n}^{n} = {r['total']:,} = {n}^({n}-2)·{n}²")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
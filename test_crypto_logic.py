@@ -0,0 +1,256 @@
+"""
+Pruebas del cifrado Hill por bloques.
+"""
+
+import io
+import os
+import random
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from logic.file_cipher import decrypt_file, encrypt_file
+from logic.cryptanalysis import buscar_rango, fuerza_bruta, recuperar_clave, recuperar_clave_numeros
+from logic.math_utils import get_matrix_from_function, inverse_matrix_mod, inversas_mod_lote, mat_mul_vec_nxn
+from logic.ranking import rank_funcion
+from logic.crypto_logic import (
+    ALPHABET,
+    CryptoEngine,
+    KeyCache,
+    MAX_TEXT_LEN,
+    char_a_num,
+    num_a_char,
+    numbers_to_text,
+    text_to_numbers,
+    hill_encrypt_numbers,
+    hill_decrypt_numbers,
+)
+
+
+def _hill_por_bloque(nums, M, block_size):
+    out = []
+    for i in range(0, len(nums), block_size):
+        out.extend(mat_mul_vec_nxn(M, nums[i:i + block_size], 30))
+    return out
+
+
+def test_hill_vectorizado_coincide_con_bloques():
+    rng = random.Random(11)
+    for _ in range(100):
+        n = rng.randint(1, 12)
+        key = get_matrix_from_function([rng.randrange(n) for _ in range(n)])
+        nums = [rng.randrange(30) for _ in range(rng.randint(0, 5 * n))]
+        
+        assert hill_encrypt_numbers(nums, key, n) == _hill_por_bloque(nums, key, n)
+        inv = inverse_matrix_mod(key)
+        assert hill_decrypt_numbers(nums, key, n) == _hill_por_bloque(nums, inv, n)
+
+
+def test_stream_ida_y_vuelta():
+    rng = random.Random(5)
+    alfabeto = ''.join(ALPHABET)
+    for n in (1, 3, 9):
+        ce = CryptoEngine(n)
+        ce.set_key_from_function([rng.randrange(n) for _ in range(n)])
+        for L in (0, 10, MAX_TEXT_LEN, MAX_TEXT_LEN + 1, 3 * MAX_TEXT_LEN + 17):
+            texto = ''.join(rng.choice(alfabeto) for _ in range(L))
+            cifrado = io.StringIO()
+            ce.encrypt_stream(io.StringIO(texto), cifrado)
+            
+            piezas = iter(cifrado.getvalue()[i:i + 13]
+                          for i in range(0, len(cifrado.getvalue()), 13))
+            assert ''.join(ce.iter_decrypt(piezas)) == texto
+            
+            # Un archivo de texto suele terminar en salto de línea
+            for final in ('\n', '\r\n'):
+                assert ''.join(ce.iter_decrypt(io.StringIO(cifrado.getvalue() + final))) == texto
+
+
+def test_stream_lee_formato_de_una_llamada():
+    ce = CryptoEngine(9)
+    ce.set_key_from_function([0, 1, 2, 5, 5, 5, 6, 7, 8])
+    cifrado = ce.encrypt("HOLA MUNDO")
+    assert ''.join(ce.iter_encrypt("HOLA MUNDO")) == cifrado
+    assert ''.join(ce.iter_decrypt(cifrado)) == "HOLA MUNDO"
+
+
+def test_tablas_coinciden_con_conversion_por_caracter():
+    texto = ''.join(chr(c) for c in range(0x10000) if not 0xD800 <= c < 0xE000) + '😀𝔸'
+    assert text_to_numbers(texto).tolist() == [char_a_num(ch) for ch in texto]
+    
+    nums = list(range(-60, 60))
+    assert numbers_to_text(nums) == ''.join(num_a_char(n) for n in nums)
+
+
+def test_inversa_de_clave_se_reutiliza():
+    ce = CryptoEngine(9)
+    ce.set_key_from_function([0, 1, 2, 5, 5, 5, 6, 7, 8])
+    cifrado = ce.encrypt("HOLA")
+    inv = ce.inv_key
+    assert ce.decrypt(cifrado) == "HOLA"
+    assert ce.inv_key is inv
+    
+    ce.set_key_from_function([1, 2, 3, 4, 5, 6, 7, 8, 0])
+    assert ce.inv_key is not inv
+    assert ce.decrypt(ce.encrypt("HOLA")) == "HOLA"
+
+
+def test_cache_de_claves_lru():
+    cache = KeyCache(maxsize=2)
+    f1, f2, f3 = [0, 1, 2], [1, 1, 2], [2, 0, 1]
+    
+    k1 = cache.get_key(f1)
+    assert cache.get_key([0, 1, 2]) is k1
+    assert (k1 == get_matrix_from_function(f1)).all()
+    cache.get_key(f2)
+    cache.get_key(f3)  # descarta f1, la menos reciente
+    assert cache.get_key(f1) is not k1
+    assert cache.info() == {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2}
+    
+    inv = cache.get_inverse(f3)
+    assert cache.get_inverse(f3) is inv
+    assert inverse_matrix_mod(cache.get_key(f3)) == inv.tolist()
+
+
+def test_cifrado_de_muchos_mensajes():
+    rng = random.Random(24)
+    simbolos = ''.join(ALPHABET) + 'abcñ!?é'
+    for n in range(1, 10):
+        ce = CryptoEngine(n)
+        ce.set_key_from_function([rng.randrange(n) for _ in range(n)])
+        mensajes = [''.join(rng.choice(simbolos) for _ in range(rng.choice([0, 1, 2, 7, 40, MAX_TEXT_LEN])))
+                    for _ in range(100)]
+        
+        cifrados = ce.encrypt_many(mensajes)
+        assert cifrados == [ce.encrypt(m) for m in mensajes]
+        assert ce.decrypt_many(cifrados) == [ce.decrypt(c) for c in cifrados]
+        
+        # Textos que no salieron de encrypt: mismo resultado que decrypt
+        basura = [''.join(rng.choice(simbolos) for _ in range(rng.randrange(30))) for _ in range(100)]
+        assert ce.decrypt_many(basura) == [ce.decrypt(c) for c in basura]
+    
+    assert ce.encrypt_many([]) == [] and ce.decrypt_many([]) == []
+    try:
+        ce.encrypt_many(["A", "B" * (MAX_TEXT_LEN + 1)])
+        assert False
+    except ValueError:
+        pass
+
+
+def test_archivos_en_paralelo_coinciden_con_stream():
+    rng = random.Random(25)
+    simbolos = ''.join(ALPHABET) + 'abcñé€\n'
+    with tempfile.TemporaryDirectory() as tmp:
+        plano, cifrado, descifrado = (os.path.join(tmp, nombre) for nombre in ("plano", "cifrado", "descifrado"))
+        
+        def leer(ruta):
+            with open(ruta, encoding='utf-8', newline='') as fh:
+                return fh.read()
+        
+        for n in (1, 2, 9):
+            ce = CryptoEngine(n)
+            ce.set_key_from_function([rng.randrange(n) for _ in range(n)])
+            for largo in (0, 1, MAX_TEXT_LEN, MAX_TEXT_LEN + 1, 12000):
+                texto = ''.join(rng.choice(simbolos) for _ in range(largo))
+                with open(plano, 'w', encoding='utf-8', newline='') as fh:
+                    fh.write(texto)
+                esperado, esperado_plano = io.StringIO(), io.StringIO()
+                ce.encrypt_stream(texto, esperado)
+                ce.decrypt_stream(esperado.getvalue(), esperado_plano)
+                
+                # Tramos pequeños para que haya varios, con y sin pool
+                for procesos in (1, 2):
+                    encrypt_file(plano, cifrado, ce.key, n, procesos, tamano_tramo=5000)
+                    assert leer(cifrado) == esperado.getvalue()
+                    decrypt_file(cifrado, descifrado, ce.key, n, procesos, tamano_tramo=7000)
+                    assert leer(descifrado) == esperado_plano.getvalue()
+                
+                ce.encrypt_file(plano, cifrado, procesos=1)
+                ce.decrypt_file(cifrado, descifrado, procesos=1)
+                assert leer(descifrado) == esperado_plano.getvalue()
+                
+                # Un salto de línea final se ignora, como en decrypt_stream
+                with open(cifrado, 'w', encoding='utf-8', newline='') as fh:
+                    fh.write(esperado.getvalue() + "\n")
+                decrypt_file(cifrado, descifrado, ce.key, n, 2, tamano_tramo=7000)
+                assert leer(descifrado) == esperado_plano.getvalue()
+                
+                # Sin el último bloque falla igual que iter_decrypt
+                truncado = esperado.getvalue()[:-n]
+                with open(cifrado, 'w', encoding='utf-8', newline='') as fh:
+                    fh.write(truncado)
+                resultados = []
+                for descifrar in (lambda: ''.join(ce.iter_decrypt(truncado)),
+                                  lambda: decrypt_file(cifrado, descifrado, ce.key, n, 2, tamano_tramo=7000) or leer(descifrado)):
+                    try:
+                        resultados.append(descifrar())
+                    except ValueError:
+                        resultados.append(None)
+                assert resultados[0] == resultados[1]
+                if largo in (MAX_TEXT_LEN, 12000):
+                    assert resultados[1] is None
+
+
+def test_recuperar_clave_con_texto_conocido():
+    rng = random.Random(23)
+    for n in range(1, 10):
+        for _ in range(5):
+            # Claves aleatorias invertibles, no solo las de get_matrix_from_function
+            while True:
+                key = [[rng.randrange(30) for _ in range(n)] for _ in range(n)]
+                if inverse_matrix_mod(key) is not None:
+                    break
+            plano = [rng.randrange(30) for _ in range(8 * n * n)]
+            cifrado = hill_encrypt_numbers(plano, key, n)
+            assert recuperar_clave_numeros(plano, cifrado, n) == key
+        
+        ce = CryptoEngine(n)
+        ce.set_key_from_function([rng.randrange(n) for _ in range(n)])
+        texto = "EL VELOZ MURCIELAGO HINDU COMIA FELIZ CARDILLO Y KIWI. " * n
+        assert recuperar_clave(texto, ce.encrypt(texto), n) == ce.key.tolist()
+    
+    # Muy pocos bloques no determinan la clave
+    assert recuperar_clave_numeros([1, 2, 3, 4], [5, 6, 7, 8], 3) is None
+    assert recuperar_clave_numeros([1, 1, 2, 2], [3, 3, 4, 4], 2) is None
+    
+    # Con un primo cuyo cuadrado no cabe en int64 el sistema se resuelve igual de exacto
+    MOD = 4294967311
+    key = [[rng.randrange(MOD) for _ in range(3)] for _ in range(3)]
+    plano = [rng.randrange(MOD) for _ in range(24)]
+    cifrado = [sum(key[i][j] * plano[b + j] for j in range(3)) % MOD for b in range(0, 24, 3) for i in range(3)]
+    assert recuperar_clave_numeros(plano, cifrado, 3, MOD) == key
+    
+    key = [[rng.randrange(30) for _ in range(6)] for _ in range(6)]
+    invs, ok = inversas_mod_lote(np.array([key, np.eye(6, dtype=int)]))
+    assert ok[1] and invs[1].tolist() == np.eye(6, dtype=int).tolist()
+    assert ok[0] == (inverse_matrix_mod(key) is not None)
+
+
+def test_fuerza_bruta_encuentra_la_funcion():
+    for n, funcion in ((3, [2, 0, 1]), (4, [1, 3, 3, 0]), (5, [4, 4, 0, 2, 1])):
+        ce = CryptoEngine(n)
+        ce.set_key_from_function(funcion)
+        cifrado = ce.encrypt("Ataque al amanecer")
+        indice = rank_funcion(funcion)
+        assert buscar_rango(cifrado, n, indice, indice + 1)['total_aciertos'] == 1
+        
+        r = fuerza_bruta(cifrado, n, procesos=1, shard=50)
+        assert r['probadas'] == n ** n and r['total_aciertos'] >= 1
+        
+        # Con un fragmento conocido solo quedan claves cuyo mensaje empieza igual;
+        # las diagonales que difieren en una sola entrada cambian solo una letra
+        con_fragmento = fuerza_bruta(cifrado, n, fragmento="ataque al", procesos=1)
+        textos = {texto for _, texto in con_fragmento['aciertos']}
+        assert 1 <= con_fragmento['total_aciertos'] <= r['total_aciertos']
+        assert "ATAQUE AL AMANECER" in textos and all(t.startswith("ATAQUE AL") for t in textos)
+        assert fuerza_bruta(cifrado, n, fragmento="retirada", procesos=1)['total_aciertos'] == 0
+
+
+if __name__ == "__main__":
+    pruebas = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    for prueba in pruebas:
+        prueba()
+        print(f"✓ {prueba.__name__}")
+    print(f"\n{len(pruebas)} pruebas OK")
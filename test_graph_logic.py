@@ -0,0 +1,322 @@
+"""
+Pruebas de la lógica de grafos y de la biyección de Joyal.
+"""
+
+import os
+import random
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from logic.graph_logic import GraphLogic, arbol_desde_funcion, arista_normalizada, indice_aristas
+from logic.joyal_batch import (
+    arboles_desde_funciones,
+    funciones_desde_arboles,
+    marcar_ciclos_lote,
+    padres_desde_aristas,
+)
+from logic.prufer import (
+    arboles_aleatorios,
+    codificar_lote,
+    codificar_prufer,
+    decodificar_lote,
+    decodificar_prufer,
+)
+from logic.ranking import (
+    arboles_desde_indices,
+    indices_desde_arboles,
+    rank_arbol,
+    rank_funcion,
+    unrank_arbol,
+    unrank_funcion,
+)
+from logic.sampler import (
+    FunctionSampler,
+    contar_funciones_con_ciclicos,
+    funciones_con_ciclicos,
+    permutaciones_aleatorias,
+)
+from logic.verifier import verificar
+
+
+def arbol_aleatorio(n, rng):
+    """Construye un GraphLogic con un árbol aleatorio de n vértices."""
+    etiquetas = list(range(n))
+    rng.shuffle(etiquetas)
+    gl = GraphLogic(n)
+    for i in range(1, n):
+        gl.agregar_arista(etiquetas[rng.randrange(i)], etiquetas[i])
+    return gl
+
+
+def test_vertices_en_ciclo_coincide_con_dfs():
+    rng = random.Random(1)
+    gl = GraphLogic(1)
+    for _ in range(500):
+        n = rng.randint(1, 12)
+        aristas = list(enumerate(rng.randrange(n) for _ in range(n)))
+        assert gl.vertices_en_ciclo(aristas) == gl._vertices_en_ciclo_dfs(aristas)
+        
+        parcial = [(u, v) for u, v in aristas if rng.random() < 0.7]
+        assert gl.vertices_en_ciclo(parcial) == gl._vertices_en_ciclo_dfs(parcial)
+
+
+def test_vertices_en_ciclo_cadena_larga():
+    n = 200000
+    funcion = [i + 1 for i in range(n - 1)] + [n - 10]
+    assert GraphLogic(1).vertices_en_ciclo(list(enumerate(funcion))) == list(range(n - 10, n))
+
+
+def test_depthfirstsearch_arbol_profundo():
+    n = 100000
+    gl = GraphLogic(n)
+    for i in range(n - 1):
+        gl.agregar_arista(i, i + 1)
+    
+    assert gl.depthfirstsearch(0, n - 1) == list(range(n))
+    assert gl.depthfirstsearch(n - 1, 5) == list(range(n - 1, 4, -1))
+    assert gl.depthfirstsearch(7, 7) == [7]
+
+
+def test_dirigir_vertices_con_indice():
+    rng = random.Random(2)
+    for _ in range(200):
+        n = rng.randint(2, 14)
+        gl = arbol_aleatorio(n, rng)
+        ini, fin = rng.randrange(n), rng.randrange(n)
+        camino = gl.depthfirstsearch(ini, fin)
+        aristas_vert = list(zip(camino, camino[1:]))
+        indice = indice_aristas(aristas_vert)
+        
+        aristas_dir = gl.dirigir_vertices(gl.aristas, aristas_vert, fin)
+        assert len(aristas_dir) == len(gl.aristas) - len(aristas_vert)
+        assert all(arista_normalizada(a, b) not in indice for a, b in aristas_dir)
+        assert all(arista_normalizada(b, a) in indice for a, b in aristas_vert)
+        assert gl.dirigir_vertices(gl.aristas, aristas_vert, fin, indice) == aristas_dir
+        
+        # El índice se construye una sola vez y viaja en el resultado
+        result = gl.construir_funcion_desde_arbol(ini, fin)
+        assert result['indice_vert'] == indice_aristas(result['aristas_vert'])
+        assert result['aristas_dir'] == aristas_dir
+
+
+def test_arbol_desde_funcion():
+    gl = GraphLogic(9)
+    result = gl.construir_arbol_desde_funcion([0, 1, 2, 5, 5, 5, 6, 7, 8])
+    assert result['camino_orden'] == [0, 1, 2, 5, 6, 7, 8]
+    assert result['camino_inv'] == [0, 1, 2, 5, 6, 7, 8]
+    assert result['camino_vertebra'] == [8, 7, 6, 5, 2, 1, 0]
+    assert result['aristas_vert'] == [(8, 7), (7, 6), (6, 5), (5, 2), (2, 1), (1, 0)]
+    assert result['aristas_dir'] == [(3, 5), (4, 5)]
+
+
+def test_arbol_desde_funcion_es_inversa():
+    rng = random.Random(6)
+    for _ in range(500):
+        n = rng.randint(1, 12)
+        funcion = [rng.randrange(n) for _ in range(n)]
+        result = GraphLogic(n).construir_arbol_desde_funcion(funcion)
+        vertebra = result['camino_vertebra']
+        
+        gl = GraphLogic(n)
+        for u, v in result['aristas_vert'] + result['aristas_dir']:
+            assert gl.agregar_arista(u, v)
+        assert gl.construir_funcion_desde_arbol(vertebra[0], vertebra[-1])['funcion'] == funcion
+
+
+def test_biyeccion_por_lotes():
+    rng = np.random.default_rng(13)
+    for n in range(1, 10):
+        funciones = rng.integers(0, n, size=(200, n))
+        padres, inicios = arboles_desde_funciones(funciones)
+        assert (funciones_desde_arboles(padres, inicios) == funciones).all()
+        
+        for t in range(0, 200, 20):
+            result = arbol_desde_funcion(funciones[t].tolist())
+            vertebra = [int(inicios[t])]
+            while padres[t, vertebra[-1]] != -1:
+                vertebra.append(int(padres[t, vertebra[-1]]))
+            assert vertebra == result['camino_vertebra']
+            assert all(padres[t, a] == b for a, b in result['aristas_dir'])
+        
+        aristas = [[(v, p) for v, p in enumerate(fila) if p != -1] for fila in padres.tolist()]
+        raices = np.argmax(padres == -1, axis=1)
+        assert (padres_desde_aristas(np.array(aristas).reshape(200, n - 1, 2), raices) == padres).all()
+
+
+def test_verificador_exhaustivo():
+    for n in range(1, 6):
+        r = verificar(n, procesos=1, shard=97)
+        assert r['biyeccion'] and r['verificadas'] == r['arboles'] == n ** n
+    assert verificar(4, procesos=1, exacto=True)['biyeccion']
+
+
+def test_verificador_reanuda_desde_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, 'ckpt.json')
+        avances = []
+        r1 = verificar(5, procesos=1, shard=500, checkpoint=ruta, progreso=avances.append)
+        r2 = verificar(5, procesos=1, shard=500, checkpoint=ruta, progreso=avances.append)
+        assert len(avances) == 7
+        assert r1 == r2 and r2['biyeccion']
+
+
+def test_ranking_de_funciones_y_arboles():
+    rng = random.Random(15)
+    for n in range(1, 9):
+        for _ in range(50):
+            indice = rng.randrange(n ** n)
+            funcion = unrank_funcion(indice, n)
+            assert rank_funcion(funcion) == indice
+            
+            aristas, ini, fin = unrank_arbol(indice, n)
+            assert rank_arbol(aristas, ini, fin) == indice
+            gl = GraphLogic(n)
+            for u, v in aristas:
+                assert gl.agregar_arista(u, v)
+            assert gl.construir_funcion_desde_arbol(ini, fin)['funcion'] == funcion
+        
+        indices = np.arange(0, n ** n, max(1, n ** n // 500))
+        padres, inicios = arboles_desde_indices(indices, n)
+        assert (indices_desde_arboles(padres, inicios) == indices).all()
+    
+    assert unrank_funcion(0, 3) == [0, 0, 0] and unrank_funcion(26, 3) == [2, 2, 2]
+    assert rank_funcion(unrank_funcion(10 ** 20, 20)) == 10 ** 20
+
+
+def test_union_find_por_tamano():
+    rng = random.Random(16)
+    for _ in range(200):
+        n = rng.randint(1, 30)
+        gl = GraphLogic(n)
+        etiqueta = list(range(n))  # componentes de referencia
+        for _ in range(rng.randint(0, 2 * n)):
+            a, b = rng.randrange(n), rng.randrange(n)
+            esperado = etiqueta[a] != etiqueta[b]
+            assert gl.agregar_arista(a, b) == esperado
+            if esperado:
+                viejo = etiqueta[b]
+                etiqueta = [etiqueta[a] if e == viejo else e for e in etiqueta]
+            assert gl.componentes == len(set(etiqueta))
+            assert gl.grafoconexo() == (len(set(etiqueta)) == 1)
+    
+    gl = GraphLogic(6)
+    assert gl.components == 6 and not gl.is_connected
+    assert gl.agregar_aristas([(0, 1), (1, 2), (2, 0), (3, 4)]) == 3
+    assert gl.components == 3
+    assert gl.agregar_aristas([(4, 5), (5, 0)]) == 2
+    assert gl.is_connected and len(gl.aristas) == 5
+    
+    # Una cadena insertada de la peor forma para la unión sin rango
+    n = 200000
+    gl = GraphLogic(n)
+    for i in range(n - 1, 0, -1):
+        assert gl.agregar_arista(i - 1, i)
+    assert gl.grafoconexo() and gl.find(n - 1) == gl.find(0)
+
+
+def test_arbol_aleatorio_prufer():
+    # Con n = 4 hay 4^2 = 16 árboles etiquetados y todos deben aparecer por igual
+    rng = random.Random(18)
+    conteo = {}
+    for _ in range(16000):
+        gl = GraphLogic(4)
+        aristas = gl.generar_arbol_aleatorio(rng)
+        assert len(aristas) == 3 and gl.is_connected
+        clave = frozenset(arista_normalizada(u, v) for u, v in aristas)
+        conteo[clave] = conteo.get(clave, 0) + 1
+    assert len(conteo) == 16
+    assert all(800 < c < 1200 for c in conteo.values())
+    
+    # Una estrella y un camino con secuencias conocidas
+    estrella = sorted(arista_normalizada(u, v) for u, v in decodificar_prufer([0, 0, 0]))
+    assert estrella == [(0, 1), (0, 2), (0, 3), (0, 4)]
+    assert len(decodificar_prufer([1, 2, 3])) == 4
+    
+    gl = GraphLogic(10 ** 5)
+    assert len(gl.generar_arbol_aleatorio(rng)) == 10 ** 5 - 1 and gl.is_connected
+    
+    for n in (1, 2, 7):
+        lote = arboles_aleatorios(20, n, seed=n)
+        assert lote.shape == (20, max(n - 1, 0), 2)
+        for aristas in lote.tolist():
+            gl = GraphLogic(n)
+            assert gl.agregar_aristas(aristas) == n - 1 and gl.is_connected
+
+
+def test_prufer_codificar_y_lotes():
+    rng = random.Random(19)
+    for n in range(1, 40):
+        for _ in range(10):
+            gl = GraphLogic(n)
+            aristas = gl.generar_arbol_aleatorio(rng)
+            rng.shuffle(aristas)
+            secuencia = codificar_prufer(aristas, n)
+            assert len(secuencia) == max(n - 2, 0)
+            assert codificar_prufer(decodificar_prufer(secuencia, n), n) == secuencia
+        
+        secuencias = np.random.default_rng(n).integers(0, n, size=(50, max(n - 2, 0)))
+        lote = decodificar_lote(secuencias, n)
+        for t in range(50):
+            assert lote[t].tolist() == [list(a) for a in decodificar_prufer(secuencias[t].tolist(), n)]
+        assert (codificar_lote(lote) == secuencias).all()
+
+
+def test_prufer_coincide_con_cayley_y_joyal():
+    # Todas las secuencias dan árboles distintos: n^(n-2) árboles etiquetados,
+    # y con n² elecciones de (inicio, fin) salen las n^n funciones de Joyal
+    for n in range(2, 7):
+        m = n - 2
+        potencias = n ** np.arange(m - 1, -1, -1, dtype=np.int64)
+        secuencias = (np.arange(n ** m)[:, np.newaxis] // potencias) % n
+        lote = decodificar_lote(secuencias, n)
+        assert (codificar_lote(lote) == secuencias).all()
+        arboles = {frozenset(arista_normalizada(u, v) for u, v in a) for a in lote.tolist()}
+        assert len(arboles) == n ** (n - 2)
+        
+        k = len(lote)
+        raices = np.repeat(np.arange(n), k)
+        padres = padres_desde_aristas(np.tile(lote, (n, 1, 1)), raices)
+        padres = np.repeat(padres, n, axis=0)
+        inicios = np.tile(np.arange(n), n * k)
+        funciones = funciones_desde_arboles(padres, inicios)
+        assert len({tuple(f) for f in funciones.tolist()}) == n ** n
+
+
+def test_muestreador_de_funciones():
+    # Con n = 4 cada clase de funciones con c cíclicos sale completa y pareja
+    n = 4
+    assert sum(contar_funciones_con_ciclicos(n, c) for c in range(1, n + 1)) == n ** n
+    for c in range(1, n + 1):
+        funciones = funciones_con_ciclicos(40000, n, c, seed=c)
+        assert (marcar_ciclos_lote(funciones).sum(axis=1) == c).all()
+        conteo = {}
+        for f in map(tuple, funciones.tolist()):
+            conteo[f] = conteo.get(f, 0) + 1
+        esperado = 40000 / contar_funciones_con_ciclicos(n, c)
+        assert len(conteo) == contar_funciones_con_ciclicos(n, c)
+        assert all(0.7 * esperado < v < 1.3 * esperado for v in conteo.values())
+    
+    for n in (1, 2, 9, 50):
+        for c in {1, n // 2 or 1, n}:
+            funciones = funciones_con_ciclicos(100, n, c, seed=n)
+            assert (marcar_ciclos_lote(funciones).sum(axis=1) == c).all()
+        permutaciones = permutaciones_aleatorias(100, n, seed=n)
+        assert (np.sort(permutaciones, axis=1) == np.arange(n)).all()
+    
+    a, b = FunctionSampler(9, seed=20), FunctionSampler(9, seed=20)
+    assert (a.lote(1000) == b.lote(1000)).all()
+    tamanos = [len(lote) for lote in a.lotes(10, tam_lote=4, ciclicos=3)]
+    assert tamanos == [4, 4, 2]
+    f = a.funcion(permutacion=True)
+    assert sorted(f) == list(range(9))
+
+
+if __name__ == "__main__":
+    pruebas = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    for prueba in pruebas:
+        prueba()
+        print(f"✓ {prueba.__name__}")
+    print(f"\n{len(pruebas)} pruebas OK")
@@ -0,0 +1,172 @@
+"""
+Pruebas de las utilidades matemáticas modulares.
+"""
+
+import math
+import random
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from logic.keyspace import analizar
+from logic.math_utils import (
+    claves_como_bytes,
+    det_mod,
+    determinante_bareiss,
+    determinantes_menores,
+    is_invertible_mod,
+    inverse_matrix_mod,
+    inverse_matrix_mod_adjugate,
+    inversas_mod_lote,
+    get_matrix_from_function,
+    matrices_desde_funciones,
+    minor_matrix,
+    son_invertibles_mod,
+)
+from logic.ranking import funciones_desde_indices
+
+
+def test_inversa_coincide_con_adjunta():
+    rng = random.Random(7)
+    for _ in range(300):
+        n = rng.randint(1, 8)
+        M = [[rng.randrange(30) for _ in range(n)] for _ in range(n)]
+        assert inverse_matrix_mod(M) == inverse_matrix_mod_adjugate(M)
+
+
+def test_inversa_con_modulos_grandes():
+    # Primos cuyo cuadrado no cabe en int64, y un compuesto con factores pequeños
+    rng = random.Random(8)
+    for MOD in (4294967311, 2 * 3037000507, 1000003 * 1000033):
+        for _ in range(20):
+            M = [[rng.randrange(MOD) for _ in range(4)] for _ in range(4)]
+            assert inverse_matrix_mod(M, MOD) == inverse_matrix_mod_adjugate(M, MOD)
+            det = determinante_bareiss(M)
+            assert det_mod(M, MOD) == det % MOD
+            assert is_invertible_mod(M, MOD) == (math.gcd(det, MOD) == 1)
+
+
+def test_inversa_de_clave():
+    for n in (3, 9, 15, 35):
+        funcion = [(i * 7 + 3) % n for i in range(n)]
+        key = get_matrix_from_function(funcion)
+        inv = inverse_matrix_mod(key)
+        assert inv is not None
+        producto = [[sum(int(key[i][k]) * inv[k][j] for k in range(n)) % 30
+                     for j in range(n)] for i in range(n)]
+        assert producto == [[int(i == j) for j in range(n)] for i in range(n)]
+
+
+def test_modulo_no_libre_de_cuadrados():
+    assert inverse_matrix_mod([[2]], 9) == [[5]]
+    assert inverse_matrix_mod([[3]], 9) is None
+
+
+def test_invertibilidad_exacta_en_funciones_aleatorias():
+    rng = random.Random(3)
+    for n in range(3, 36):
+        for _ in range(4):
+            funcion = [rng.randrange(n) for _ in range(n)]
+            candidata = [[(funcion[i] * (j + 1) + funcion[j] + 1) % 30 for j in range(n)]
+                         for i in range(n)]
+            exacta = math.gcd(determinante_bareiss(candidata), 30) == 1
+            assert is_invertible_mod(candidata, 30) == exacta
+            
+            key = get_matrix_from_function(funcion)
+            assert is_invertible_mod(key, 30)
+            assert math.gcd(determinante_bareiss(key.tolist()), 30) == 1
+
+
+def test_det_mod_en_matrices_grandes():
+    rng = random.Random(4)
+    for n in (15, 25, 35):
+        M = [[rng.randrange(30) for _ in range(n)] for _ in range(n)]
+        det = determinante_bareiss(M)
+        assert det_mod(M, 30) == det % 30
+        assert is_invertible_mod(M, 30) == (math.gcd(det, 30) == 1)
+
+
+def test_bareiss_modular_y_menores():
+    rng = random.Random(8)
+    for _ in range(100):
+        n = rng.randint(1, 7)
+        M = [[rng.randint(-10, 29) for _ in range(n)] for _ in range(n)]
+        det = determinante_bareiss(M)
+        for p in (2, 3, 5, 7):
+            assert determinante_bareiss(M, p) == det % p
+        
+        menores = determinantes_menores(M)
+        for i in range(n):
+            for j in range(n):
+                assert menores[i][j] == determinante_bareiss(minor_matrix(M, i, j))
+        assert determinantes_menores(M, 3) == [[d % 3 for d in fila] for fila in menores]
+
+
+def test_claves_por_lotes():
+    rng = np.random.default_rng(21)
+    for n in range(1, 9):
+        for mod in (30, 7, 12):
+            funciones = rng.integers(0, 2 * n, size=(100, n))
+            claves, directas = matrices_desde_funciones(funciones, mod)
+            for f, clave in zip(funciones.tolist(), claves):
+                assert (get_matrix_from_function(f, mod) == clave).all()
+            assert (son_invertibles_mod(claves, mod) | ~directas).all()
+            
+            # Con dim distinto de n la función se repite cíclicamente
+            claves, _ = matrices_desde_funciones(funciones[:10], mod, dim=n + 2)
+            assert claves.shape == (10, n + 2, n + 2)
+            for f, clave in zip(funciones[:10].tolist(), claves):
+                assert (get_matrix_from_function(f, mod, n + 2) == clave).all()
+        
+        mats = rng.integers(0, 30, size=(200, n, n))
+        assert son_invertibles_mod(mats, 30).tolist() == [is_invertible_mod(m, 30) for m in mats]
+
+
+def test_estadisticas_del_espacio_de_claves():
+    # La matriz generada tiene rango <= 2 (y es singular mod 2 con n = 2),
+    # así que desde n = 2 toda clave es la diagonal de respaldo
+    for n in range(1, 6):
+        r = analizar(n, procesos=1, shard=100)
+        assert r['total'] == n ** n
+        assert r['respaldo'] == (0 if n == 1 else n ** n)
+        funciones = funciones_desde_indices(np.arange(n ** n), n)
+        claves = {c.tobytes() for c in matrices_desde_funciones(funciones)[0]}
+        assert r['claves_distintas'] == len(claves)
+        assert r['funciones_en_colision'] - r['claves_en_colision'] == n ** n - len(claves)
+    
+    a = analizar(6, muestras=5000, semilla=3, procesos=1, shard=1024)
+    b = analizar(6, muestras=5000, semilla=3, procesos=2, shard=1024)
+    assert a['total'] == 5000 and a['claves_distintas'] == b['claves_distintas']
+
+
+def test_claves_con_modulo_mayor_a_256():
+    # Con MOD > 256 las entradas no caben en un byte: 0 y 256 deben seguir siendo distintas
+    claves = np.array([[[0]], [[256]], [[0]]])
+    for MOD in (257, 70000):
+        unicas, cantidades = np.unique(claves_como_bytes(claves, MOD), return_counts=True)
+        assert cantidades.tolist() == [2, 1]
+    
+    # Con un primo grande no se arman tablas de p entradas ni se desborda int64
+    funciones = funciones_desde_indices(np.arange(27), 3)
+    for MOD in (257, 10000019, 4294967311):
+        r = analizar(3, procesos=1, shard=10, MOD=MOD)
+        claves = matrices_desde_funciones(funciones, MOD)[0]
+        assert r['claves_distintas'] == len({c.tobytes() for c in claves})
+        
+        rng = random.Random(MOD)
+        mats = np.array([[[rng.randrange(MOD) for _ in range(3)] for _ in range(3)] for _ in range(30)])
+        mats[::3, 0] = 0
+        inversas, invertibles = inversas_mod_lote(mats, MOD)
+        assert invertibles.tolist() == son_invertibles_mod(mats, MOD).tolist()
+        for m, inv, ok in zip(mats, inversas, invertibles):
+            esperada = inverse_matrix_mod(m.tolist(), MOD)
+            assert ok == (esperada is not None) and (not ok or inv.tolist() == esperada)
+
+
+if __name__ == "__main__":
+    pruebas = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    for prueba in pruebas:
+        prueba()
+        print(f"✓ {prueba.__name__}")
+    print(f"\n{len(pruebas)} pruebas OK")